@@ -1,18 +1,20 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
+import io
 import re
-from collections import Counter
 import warnings
+import contextlib
+import data_cache
+import incremental
+from instrumentation import profiler, stage, instrumented
+from token_counts import TokenCounts
+from sketches import ApproxSummary
+from backends import as_backend, DuckDBBackend
+from date_parsing import DATETIME_DTYPE, parse_date, parse_dates, date_parts, date_texts
 warnings.filterwarnings('ignore')
-
-# Set up plotting style
-plt.style.use('seaborn-v0_8')
-sns.set_style('whitegrid')
 pd.set_option('display.max_columns', None)
 
+@instrumented()
 def load_and_explore_data(file_path):
     """Load data and perform initial exploration"""
     df = pd.read_csv(file_path)
@@ -34,40 +36,427 @@ def load_and_explore_data(file_path):
     
     return df
 
-def clean_data(df):
+# Columns the pipeline actually reads, with explicit dtypes for chunked loading
+# (cord_uid/doi, when the file has them, are the stable row keys of incremental mode)
+USED_COLUMNS = [
+    'cord_uid', 'doi',
+    'paper_title', 'description', 'abstract', 'author_list',
+    'source_organization', 'license',
+    'last_updated', 'publication_date', 'date', 'year',
+]
+COLUMN_DTYPES = {
+    'cord_uid': 'object',
+    'doi': 'object',
+    'paper_title': 'object',
+    'description': 'object',
+    'abstract': 'object',
+    'author_list': 'object',
+    'source_organization': 'object',
+    'license': 'object',
+    'last_updated': 'object',
+    'publication_date': 'object',
+    'date': 'object',
+    'year': 'float64',
+}
+
+# Cleaning parameters (part of the cleaned-data cache key)
+MISSING_THRESHOLD = 50
+DATE_COLUMNS = ['last_updated', 'publication_date', 'date']
+TEXT_COLUMNS = ['description', 'paper_title', 'abstract']
+
+# Compact mode: string columns stored as category when they repeat enough
+CATEGORY_COLUMNS = ['source_organization', 'license', 'author_list']
+CATEGORY_MAX_UNIQUE_RATIO = 0.5
+
+class RunningStats:
+    """Mergeable running count/mean/variance/min/max for one numeric column"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """Fold a chunk of values into the running statistics"""
+        values = pd.to_numeric(pd.Series(values), errors='coerce').dropna().to_numpy(dtype='float64')
+        if len(values) == 0:
+            return self
+        chunk = RunningStats()
+        chunk.count = len(values)
+        chunk.mean = float(values.mean())
+        chunk.m2 = float(((values - chunk.mean) ** 2).sum())
+        chunk.min = float(values.min())
+        chunk.max = float(values.max())
+        return self.merge(chunk)
+
+    def merge(self, other):
+        """Combine another RunningStats into this one (Chan et al. parallel update)"""
+        if other.count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        # Sample variance, matching pandas' describe()
+        return self.m2 / (self.count - 1) if self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def to_dict(self):
+        return {
+            'count': float(self.count),
+            'mean': self.mean if self.count else np.nan,
+            'std': self.std,
+            'min': self.min if self.count else np.nan,
+            'max': self.max if self.count else np.nan,
+        }
+
+def _merge_dtype(current, new):
+    """Promote a column dtype seen in an earlier chunk against a later one"""
+    if current is None or current == new:
+        return new
+    if pd.api.types.is_numeric_dtype(current) and pd.api.types.is_numeric_dtype(new):
+        return np.promote_types(current, new)
+    return np.dtype('object')
+
+@instrumented()
+def explore_data_streaming(file_path, chunksize=100_000, usecols=USED_COLUMNS, dtype=COLUMN_DTYPES):
+    """Explore a large CSV chunk by chunk so peak memory stays bounded"""
+    wanted = set(usecols) if usecols is not None else None
+    reader = pd.read_csv(
+        file_path,
+        chunksize=chunksize,
+        usecols=(lambda c: c in wanted) if wanted is not None else None,
+        dtype=dtype,
+    )
+    
+    n_rows = 0
+    missing_counts = None
+    dtypes = {}
+    stats = {}
+    for chunk in reader:
+        n_rows += len(chunk)
+        chunk_missing = chunk.isnull().sum()
+        missing_counts = chunk_missing if missing_counts is None else missing_counts.add(chunk_missing, fill_value=0)
+        for col, col_dtype in chunk.dtypes.items():
+            dtypes[col] = _merge_dtype(dtypes.get(col), col_dtype)
+        for col in chunk.select_dtypes(include='number').columns:
+            stats.setdefault(col, RunningStats()).update(chunk[col])
+    
+    columns = list(dtypes)
+    dtypes = pd.Series(dtypes, dtype='object')
+    if missing_counts is None:
+        missing_counts = pd.Series(dtype='int64')
+    missing_percentage = (missing_counts / n_rows) * 100 if n_rows else missing_counts.astype('float64')
+    statistics = pd.DataFrame({col: s.to_dict() for col, s in stats.items()})
+    
+    print("=== DATASET EXPLORATION (streaming) ===")
+    print(f"Dataset shape: ({n_rows}, {len(columns)})")
+    print(f"\nColumn names: {columns}")
+    print(f"\nData types:\n{dtypes}")
+    print(f"\nMissing values (>0%):")
+    print(missing_percentage[missing_percentage > 0].sort_values(ascending=False))
+    print("\nBasic statistics for numerical columns:")
+    print(statistics)
+    
+    return {
+        'shape': (n_rows, len(columns)),
+        'columns': columns,
+        'dtypes': dtypes,
+        'missing_percentage': missing_percentage,
+        'statistics': statistics,
+    }
+
+@instrumented()
+def clean_data(df, vectorized=True, compact=False, workers=None, cols_to_drop=None):
     """Clean and preprocess the dataset"""
     df_clean = df.copy()
     
-    # Drop columns with more than 50% missing values
-    missing_percentage = (df_clean.isnull().sum() / len(df_clean)) * 100
-    cols_to_drop = missing_percentage[missing_percentage > 50].index
+    # Drop columns with more than 50% missing values (unless the caller fixes the set)
+    if cols_to_drop is None:
+        missing_percentage = (df_clean.isnull().sum() / len(df_clean)) * 100
+        cols_to_drop = missing_percentage[missing_percentage > MISSING_THRESHOLD].index
+    cols_to_drop = pd.Index(cols_to_drop)
     df_clean.drop(columns=cols_to_drop, inplace=True)
-    print(f"\nDropped columns (>50% missing): {cols_to_drop.tolist()}")
+    print(f"\nDropped columns (>{MISSING_THRESHOLD}% missing): {cols_to_drop.tolist()}")
     print(f"Remaining columns: {df_clean.columns.tolist()}")
     
     # Fill missing values
     if 'author_list' in df_clean.columns:
         df_clean['author_list'] = df_clean['author_list'].fillna('Unknown')
     
-    # Extract year from date columns
-    date_columns = ['last_updated', 'publication_date', 'date']
-    for col in date_columns:
-        if col in df_clean.columns:
-            df_clean[f'{col}_year'] = df_clean[col].apply(extract_year)
+    # Parse dates and count words in a process pool; the loops below insert the results
+    derived, unmatched = {}, {}
+    if vectorized and workers and workers > 1:
+        with stage('derive_columns_parallel'):
+            derived, unmatched = _derive_columns_parallel(df_clean, workers)
+    
+    # Parse date columns into datetime, year and month columns
+    for col in DATE_COLUMNS:
+        if col not in df_clean.columns or f'{col}_year' in df_clean.columns:
+            continue
+        with stage(f'{col}_dates'):
+            if f'{col}_datetime' in derived:
+                df_clean[f'{col}_datetime'] = derived[f'{col}_datetime']
+            elif f'{col}_datetime' not in df_clean.columns:
+                if vectorized:
+                    df_clean[f'{col}_datetime'], unmatched[col] = parse_dates(df_clean[col], return_unmatched=True)
+                else:
+                    df_clean[f'{col}_datetime'] = df_clean[col].apply(parse_date).astype(DATETIME_DTYPE)
+            if unmatched.get(col):
+                print(f"⚠️ {unmatched[col]:,} {col} values match no known date format and are left missing")
+            df_clean[f'{col}_year'], df_clean[f'{col}_month'] = date_parts(df_clean[f'{col}_datetime'])
     
     # Create word count features
-    text_columns = ['description', 'paper_title', 'abstract']
-    for col in text_columns:
+    for col in TEXT_COLUMNS:
+        if f'{col}_word_count' in df_clean.columns:
+            continue
         if col in df_clean.columns:
-            df_clean[f'{col}_word_count'] = df_clean[col].apply(get_word_count)
+            with stage(f'{col}_word_count'):
+                if f'{col}_word_count' in derived:
+                    df_clean[f'{col}_word_count'] = derived[f'{col}_word_count']
+                elif vectorized:
+                    df_clean[f'{col}_word_count'] = count_words(df_clean[col])
+                else:
+                    df_clean[f'{col}_word_count'] = df_clean[col].apply(get_word_count)
+    
+    if compact:
+        df_clean = compact_dtypes(df_clean)
     
     print(f"\nCleaned dataset info:")
     print(f"Rows: {df_clean.shape[0]}, Columns: {df_clean.shape[1]}")
     
     return df_clean
 
+def _as_arrow_strings(series):
+    """Arrow string array of a column; non-string cells become null"""
+    import pyarrow as pa
+    
+    values = series.to_numpy(dtype='object')
+    try:
+        return pa.array(values, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Non-string cells give NaN years and 0 words either way
+        is_str = np.fromiter((isinstance(v, str) for v in values), dtype=bool, count=len(values))
+        return pa.array(np.where(is_str, values, None), type=pa.string())
+
+def _write_ipc_stream(table, sink):
+    """Write a table as an Arrow IPC stream to sink; returns the bytes written"""
+    import pyarrow as pa
+    
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.tell()
+
+def _derive_partition(table_name, table_size, out_name, n_rows, start, stop, date_cols, text_cols):
+    """Worker: parse dates and count words for rows [start, stop) via shared memory
+
+    Returns the number of unmatched date cells per date column.
+    """
+    import pyarrow as pa
+    from multiprocessing import shared_memory
+    
+    table_shm = shared_memory.SharedMemory(name=table_name)
+    out_shm = shared_memory.SharedMemory(name=out_name)
+    try:
+        # The Arrow table is read zero-copy from the shared buffer
+        buffer = pa.py_buffer(table_shm.buf[:table_size])
+        part = pa.ipc.open_stream(buffer).read_all().slice(start, stop - start).to_pandas()
+        out = np.ndarray((len(date_cols) + len(text_cols), n_rows), dtype='float64', buffer=out_shm.buf)
+        unmatched = {}
+        for i, col in enumerate(date_cols):
+            dates, unmatched[col] = parse_dates(part[col], return_unmatched=True)
+            # datetime64 bits are stored as-is in the float64 result array
+            out[i, start:stop] = dates.to_numpy().view('float64')
+        for i, col in enumerate(text_cols, start=len(date_cols)):
+            out[i, start:stop] = count_words(part[col]).to_numpy()
+        # Views must be released before the shared memory can be closed
+        del out, part, buffer
+    finally:
+        table_shm.close()
+        out_shm.close()
+    return unmatched
+
+def _derive_columns_parallel(df_clean, workers):
+    """Derive the *_datetime and *_word_count columns across a process pool
+    
+    The input columns go to the workers once, as an Arrow IPC stream in
+    shared memory. Workers write results into a shared float64 array, so
+    no DataFrame is pickled in either direction. Returns a dict of the
+    derived columns, which clean_data inserts in the serial column order,
+    and the number of unmatched date cells per date column.
+    """
+    import pyarrow as pa
+    from concurrent.futures import ProcessPoolExecutor
+    from multiprocessing import shared_memory
+    
+    date_cols = [col for col in DATE_COLUMNS if col in df_clean.columns]
+    text_cols = [col for col in TEXT_COLUMNS if col in df_clean.columns]
+    n_rows = len(df_clean)
+    if not (date_cols or text_cols) or n_rows == 0:
+        return {}, {}
+    
+    # Non-string date cells (e.g. numeric years in an object column) are normalized the way
+    # the serial path reads them, once per distinct value; only a true string dtype is
+    # guaranteed to hold no other values
+    date_arrays = [_as_arrow_strings(df_clean[col] if isinstance(df_clean[col].dtype, pd.StringDtype)
+                                     else date_texts(df_clean[col])) for col in date_cols]
+    table = pa.table(date_arrays + [_as_arrow_strings(df_clean[col]) for col in text_cols],
+                     names=date_cols + text_cols)
+    table_size = _write_ipc_stream(table, pa.MockOutputStream())
+    
+    table_shm = shared_memory.SharedMemory(create=True, size=table_size)
+    out_shm = shared_memory.SharedMemory(create=True, size=8 * n_rows * (len(date_cols) + len(text_cols)))
+    try:
+        _write_ipc_stream(table, pa.FixedSizeBufferWriter(pa.py_buffer(table_shm.buf)))
+        del table
+        
+        # A few partitions per worker keeps the pool busy when partitions are uneven
+        bounds = np.linspace(0, n_rows, min(n_rows, workers * 4) + 1).astype(int)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_derive_partition, table_shm.name, table_size, out_shm.name, n_rows,
+                            start, stop, date_cols, text_cols)
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            unmatched = dict.fromkeys(date_cols, 0)
+            for future in futures:
+                for col, count in future.result().items():
+                    unmatched[col] += count
+        
+        out = np.ndarray((len(date_cols) + len(text_cols), n_rows), dtype='float64', buffer=out_shm.buf)
+        derived = {}
+        for i, col in enumerate(date_cols):
+            derived[f'{col}_datetime'] = pd.Series(out[i].view('int64').astype(DATETIME_DTYPE), index=df_clean.index)
+        for i, col in enumerate(text_cols, start=len(date_cols)):
+            derived[f'{col}_word_count'] = pd.Series(out[i].astype('int64'), index=df_clean.index)
+        del out
+    finally:
+        for shm in (table_shm, out_shm):
+            shm.close()
+            shm.unlink()
+    return derived, unmatched
+
+@instrumented()
+def compact_dtypes(df):
+    """Convert repetitive strings to category, years/months to Int16/Int8 and word counts to int32"""
+    memory_before = df.memory_usage(deep=True).sum()
+    df = df.copy()
+    
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and pd.api.types.is_string_dtype(df[col].dtype) and len(df) > 0:
+            if df[col].nunique() / len(df) <= CATEGORY_MAX_UNIQUE_RATIO:
+                df[col] = df[col].astype('category')
+    
+    for col in [c for c in df.columns if 'year' in c]:
+        if pd.api.types.is_numeric_dtype(df[col]):
+            df[col] = df[col].round().astype('Int16')
+    
+    for col in [c for c in df.columns if c.endswith('_month')]:
+        df[col] = df[col].round().astype('Int8')
+    
+    for col in [c for c in df.columns if c.endswith('_word_count')]:
+        df[col] = df[col].astype('int32')
+    
+    memory_after = df.memory_usage(deep=True).sum()
+    df.attrs['memory_before_compact'] = int(memory_before)
+    print(f"\n🗜️ Compact dtypes: {memory_before / 1024**2:.2f} MB -> {memory_after / 1024**2:.2f} MB")
+    return df
+
+def cleaning_parameters(chunksize=None, compact=False):
+    """Parameters that determine the cleaned frame, used to key the cache"""
+    return {
+        'missing_threshold': MISSING_THRESHOLD,
+        'date_columns': DATE_COLUMNS,
+        'text_columns': TEXT_COLUMNS,
+        # Chunked mode only reads the columns the pipeline uses
+        'usecols': USED_COLUMNS if chunksize else None,
+        'compact': compact,
+    }
+
+@instrumented()
+def load_cleaned_data(file_path, chunksize=None, compact=False, rebuild=False, cache_dir=data_cache.CACHE_DIR,
+                      workers=None, snapshot_dir=None):
+    """Load the cleaned dataset, reusing the columnar cache when it is fresh
+
+    With snapshot_dir, only rows that are new or changed since the previous
+    release are cleaned and merged into the stored snapshot; rebuild also
+    starts the snapshot over.
+    """
+    params = cleaning_parameters(chunksize, compact)
+    if not rebuild:
+        with stage('read_cache'):
+            df_clean = data_cache.read_cache(file_path, params, cache_dir)
+        if df_clean is not None:
+            print(f"⚡ Loaded cleaned data from cache: {df_clean.shape[0]} rows, {df_clean.shape[1]} columns")
+            return df_clean
+    
+    if chunksize and not snapshot_dir:
+        return _load_cleaned_chunked(file_path, chunksize, compact, params, cache_dir)
+    if chunksize:
+        # The snapshot diff needs the whole release: explore in chunks, then load the used columns
+        explore_data_streaming(file_path, chunksize=chunksize)
+        df = pd.read_csv(file_path, usecols=lambda c: c in set(USED_COLUMNS), dtype=COLUMN_DTYPES)
+    else:
+        df = load_and_explore_data(file_path)
+    
+    if snapshot_dir:
+        with stage('incremental_update'):
+            df_clean, aggregates, changes = incremental.update_snapshot(
+                df, snapshot_dir, lambda delta, cols_to_drop: clean_data(delta, workers=workers, cols_to_drop=cols_to_drop),
+                params=cleaning_parameters(chunksize), source_path=file_path, rebuild=rebuild)
+        incremental.print_changes(changes, aggregates)
+        if compact:
+            df_clean = compact_dtypes(df_clean)
+    else:
+        df_clean = clean_data(df, compact=compact, workers=workers)
+    with stage('write_cache'):
+        cache_path = data_cache.write_cache(df_clean, file_path, params, cache_dir)
+    if cache_path:
+        print(f"💾 Cached cleaned data to {cache_path}")
+    return df_clean
+
+def _load_cleaned_chunked(file_path, chunksize, compact, params, cache_dir):
+    """Clean the CSV chunk by chunk straight into the columnar cache, then memory-map it
+    
+    The raw file is never held in memory: peak memory is one raw chunk
+    plus the cleaned frame read back from the cache.
+    """
+    full_params = cleaning_parameters(chunksize)
+    with stage('write_cache'):
+        cache_path = data_cache.write_cache_chunks(_cleaned_chunks(file_path, chunksize), file_path,
+                                                   full_params, cache_dir)
+    if cache_path is None:
+        # Without pyarrow there is no cache to stream into
+        df_clean = pd.concat(_cleaned_chunks(file_path, chunksize), ignore_index=True)
+    else:
+        print(f"💾 Cached cleaned data to {cache_path}")
+        df_clean = data_cache.read_cache(file_path, full_params, cache_dir)
+    print(f"\nCleaned dataset info:")
+    print(f"Rows: {df_clean.shape[0]}, Columns: {df_clean.shape[1]}")
+    if compact:
+        df_clean = compact_dtypes(df_clean)
+        with stage('write_cache'):
+            data_cache.write_cache(df_clean, file_path, params, cache_dir)
+    return df_clean
+
 def extract_year(date_str):
-    """Extract year from various date formats"""
+    """Extract year from various date formats (per-cell regex; the benchmark baseline for parse_dates)"""
     try:
         if pd.isna(date_str):
             return None
@@ -90,233 +479,522 @@ def get_word_count(text):
         return len(text.split())
     return 0
 
-def analyze_data(df):
-    """Perform comprehensive data analysis"""
+def count_words(series):
+    """Column-level get_word_count: whitespace-separated tokens, 0 for missing/non-text"""
+    # str.split runs in C; this only drops the per-cell pd.isna and apply overhead
+    values = series.to_numpy(dtype='object')
+    counts = np.fromiter((len(v.split()) if isinstance(v, str) else 0 for v in values),
+                         dtype='int64', count=len(values))
+    return pd.Series(counts, index=series.index, name=series.name)
+
+@instrumented()
+def analyze_data(df, token_counts=None):
+    """Perform comprehensive data analysis (df is a DataFrame or a query backend)"""
+    backend = as_backend(df, token_counts)
+    columns = backend.columns
     print("\n" + "="*50)
     print("COMPREHENSIVE DATA ANALYSIS")
     print("="*50)
     
     # Year analysis
-    year_cols = [col for col in df.columns if 'year' in col]
+    year_cols = [col for col in columns if 'year' in col]
     for year_col in year_cols:
-        if year_col in df.columns:
-            year_counts = df[year_col].value_counts().sort_index()
-            print(f"\n📊 Papers by {year_col}:")
-            print(year_counts)
-            print(f"Year range: {df[year_col].min()} - {df[year_col].max()}")
+        year_counts = backend.year_counts(year_col)
+        print(f"\n📊 Papers by {year_col}:")
+        print(year_counts)
+        if len(year_counts):
+            print(f"Year range: {year_counts.index.min()} - {year_counts.index.max()}")
+    
+    # Month-level trend from the first parsed date column
+    date_cols = [col for col in columns if col.endswith('_datetime')]
+    if date_cols:
+        month_counts = backend.month_counts(date_cols[0])
+        if len(month_counts):
+            print(f"\n📆 Papers by month ({date_cols[0]}, last 12 months with papers):")
+            print(month_counts.tail(12))
     
     # Source organization analysis
-    if 'source_organization' in df.columns:
-        source_counts = df['source_organization'].value_counts().head(15)
+    if 'source_organization' in columns:
+        source_counts = backend.counts('source_organization', limit=15)
         print(f"\n🏢 Top 15 source organizations:")
         for org, count in source_counts.items():
             print(f"  {org}: {count} papers")
     
     # Author analysis
-    if 'author_list' in df.columns:
+    if 'author_list' in columns:
         # Count papers with known authors
-        known_authors = df[df['author_list'] != 'Unknown']
+        known_authors = backend.count_not_equal('author_list', 'Unknown')
         print(f"\n👥 Author Statistics:")
-        print(f"  Papers with known authors: {len(known_authors)} ({len(known_authors)/len(df)*100:.1f}%)")
-        print(f"  Papers with unknown authors: {len(df) - len(known_authors)} ({(len(df) - len(known_authors))/len(df)*100:.1f}%)")
+        print(f"  Papers with known authors: {known_authors} ({known_authors/backend.n_rows*100:.1f}%)")
+        print(f"  Papers with unknown authors: {backend.n_rows - known_authors} ({(backend.n_rows - known_authors)/backend.n_rows*100:.1f}%)")
     
     # Text analysis
-    if 'paper_title' in df.columns:
-        all_titles = ' '.join(df['paper_title'].dropna().astype(str))
-        # Filter out common stop words and short words
-        stop_words = {'the', 'and', 'of', 'in', 'to', 'a', 'for', 'with', 'on', 'as', 'by', 'an', 'at'}
-        title_words = [word.lower() for word in all_titles.split() 
-                      if len(word) > 3 and word.lower() not in stop_words]
-        word_freq = Counter(title_words)
+    if 'paper_title' in columns:
+        # Short words and common stop words are filtered out (see TokenCounts)
+        top_words = backend.top_words('paper_title', 20)
         print(f"\n📝 Top 20 meaningful words in paper titles:")
-        for word, count in word_freq.most_common(20):
+        for word, count in top_words:
             print(f"  {word}: {count}")
     
     # License analysis
-    if 'license' in df.columns:
-        license_counts = df['license'].value_counts()
+    if 'license' in columns:
+        license_counts = backend.counts('license')
         print(f"\n📄 Papers by license type:")
         for license_type, count in license_counts.items():
             print(f"  {license_type}: {count} papers")
     
     # Word count analysis
-    word_count_cols = [col for col in df.columns if 'word_count' in col]
+    word_count_cols = [col for col in columns if 'word_count' in col]
     for col in word_count_cols:
-        if col in df.columns:
-            stats = df[col].describe()
-            print(f"\n📊 {col.replace('_', ' ').title()} Statistics:")
-            print(f"  Mean: {stats['mean']:.1f}")
-            print(f"  Median: {stats['50%']:.1f}")
-            print(f"  Max: {stats['max']:.1f}")
-            print(f"  Min: {stats['min']:.1f}")
-
-def create_visualizations(df):
-    """Create comprehensive visualizations"""
-    print("\n📈 Generating visualizations...")
-    
-    fig = plt.figure(figsize=(20, 16))
+        stats = backend.numeric_summary(col)
+        print(f"\n📊 {col.replace('_', ' ').title()} Statistics:")
+        print(f"  Mean: {stats['mean']:.1f}")
+        print(f"  Median: {stats['median']:.1f}")
+        print(f"  Max: {stats['max']:.1f}")
+        print(f"  Min: {stats['min']:.1f}")
+
+# matplotlib, seaborn and wordcloud are imported on first use, so text-only runs never load them
+_plot_style_applied = False
+
+def _apply_plot_style():
+    """Import the plotting stack and set up the plotting style (once per process)"""
+    global _plot_style_applied
+    import matplotlib.pyplot as plt
+    if not _plot_style_applied:
+        import seaborn as sns
+        plt.style.use('seaborn-v0_8')
+        sns.set_style('whitegrid')
+        _plot_style_applied = True
+    return plt
+
+def _draw_publications_by_year(ax, year_counts):
+    ax.bar(year_counts.index, year_counts.values, color='skyblue', alpha=0.7, edgecolor='navy')
+    ax.set_title('Publications by Year', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Number of Papers')
+    ax.tick_params(axis='x', labelrotation=45)
+    ax.grid(True, alpha=0.3)
+
+def _draw_top_source_organizations(ax, source_counts):
+    y_pos = np.arange(len(source_counts))
+    ax.barh(y_pos, source_counts.values, color='lightgreen', alpha=0.7, edgecolor='darkgreen')
+    ax.set_yticks(y_pos, source_counts.index)
+    ax.set_title('Top 10 Source Organizations', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Number of Papers')
+    ax.grid(True, alpha=0.3)
+
+def _draw_title_wordcloud(ax, frequencies):
+    from wordcloud import WordCloud
+    wordcloud = WordCloud(width=600, height=300, background_color='white', 
+                         max_words=100, colormap='viridis').generate_from_frequencies(frequencies)
+    ax.imshow(wordcloud, interpolation='bilinear')
+    ax.set_title('Word Cloud of Paper Titles', fontsize=14, fontweight='bold')
+    ax.axis('off')
+
+def _draw_description_word_count(ax, word_counts):
+    ax.hist(word_counts, bins=30, color='orange', alpha=0.7, edgecolor='darkorange')
+    ax.set_title('Description Word Count Distribution', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Word Count')
+    ax.set_ylabel('Frequency')
+    ax.grid(True, alpha=0.3)
+
+def _draw_license_distribution(ax, license_counts):
+    from matplotlib import colormaps
+    colors = colormaps['Set3'](np.linspace(0, 1, len(license_counts)))
+    ax.pie(license_counts.values, labels=license_counts.index, autopct='%1.1f%%', 
+           startangle=90, colors=colors, textprops={'fontsize': 10})
+    ax.set_title('Distribution by License Type', fontsize=14, fontweight='bold')
+
+def _draw_publication_trend(ax, year_counts):
+    ax.plot(year_counts.index, year_counts.values, marker='o', linewidth=2, 
+            markersize=6, color='red', alpha=0.7)
+    ax.set_title('Publication Trend Over Time', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Year')
+    ax.set_ylabel('Number of Papers')
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=45)
+
+def _draw_author_availability(ax, sizes):
+    labels = ['Known Authors', 'Unknown Authors']
+    colors = ['lightblue', 'lightcoral']
+    ax.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
+    ax.set_title('Author Information Availability', fontsize=14, fontweight='bold')
+
+def _draw_top_title_words(ax, top_words):
+    words = [word[0] for word in top_words]
+    counts = [word[1] for word in top_words]
+    
+    y_pos = np.arange(len(words))
+    ax.barh(y_pos, counts, color='purple', alpha=0.7)
+    ax.set_yticks(y_pos, words)
+    ax.set_title('Top 10 Words in Titles', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Frequency')
+
+def _draw_word_count_boxplot(ax, word_count_data):
+    ax.boxplot(list(word_count_data.values()))
+    ax.set_xticks(np.arange(1, len(word_count_data) + 1), list(word_count_data))
+    ax.set_title('Word Count Distribution by Text Type', fontsize=14, fontweight='bold')
+    ax.set_ylabel('Word Count')
+    ax.tick_params(axis='x', labelrotation=45)
+
+# Panels of the 3x3 overview, in grid order
+PANELS = [
+    ('publications_by_year', _draw_publications_by_year),
+    ('top_source_organizations', _draw_top_source_organizations),
+    ('title_wordcloud', _draw_title_wordcloud),
+    ('description_word_count', _draw_description_word_count),
+    ('license_distribution', _draw_license_distribution),
+    ('publication_trend', _draw_publication_trend),
+    ('author_availability', _draw_author_availability),
+    ('top_title_words', _draw_top_title_words),
+    ('word_count_boxplot', _draw_word_count_boxplot),
+]
+
+@instrumented()
+def panel_data(df, token_counts=None):
+    """Small per-panel inputs for the plots; panels without data are left out"""
+    if 'paper_title' in df.columns and token_counts is None:
+        token_counts = TokenCounts.from_texts(df['paper_title'])
+    data = {}
     
-    # Plot 1: Publications by year
-    ax1 = plt.subplot(3, 3, 1)
     year_cols = [col for col in df.columns if 'year' in col]
     if year_cols and df[year_cols[0]].notna().sum() > 0:
         year_counts = df[year_cols[0]].value_counts().sort_index()
-        plt.bar(year_counts.index, year_counts.values, color='skyblue', alpha=0.7, edgecolor='navy')
-        plt.title('Publications by Year', fontsize=14, fontweight='bold')
-        plt.xlabel('Year')
-        plt.ylabel('Number of Papers')
-        plt.xticks(rotation=45)
-        plt.grid(True, alpha=0.3)
-    
-    # Plot 2: Top source organizations
-    ax2 = plt.subplot(3, 3, 2)
+        year_counts.index = year_counts.index.astype('float64')
+        data['publications_by_year'] = year_counts
+        if len(year_counts) > 1:
+            data['publication_trend'] = year_counts
+    
     if 'source_organization' in df.columns:
-        source_counts = df['source_organization'].value_counts().head(10)
-        y_pos = np.arange(len(source_counts))
-        plt.barh(y_pos, source_counts.values, color='lightgreen', alpha=0.7, edgecolor='darkgreen')
-        plt.yticks(y_pos, source_counts.index)
-        plt.title('Top 10 Source Organizations', fontsize=14, fontweight='bold')
-        plt.xlabel('Number of Papers')
-        plt.grid(True, alpha=0.3)
-    
-    # Plot 3: Word cloud of paper titles
-    ax3 = plt.subplot(3, 3, 3)
+        source_counts = df['source_organization'].value_counts()
+        data['top_source_organizations'] = source_counts[source_counts > 0].head(10)
+    
     if 'paper_title' in df.columns:
-        all_titles = ' '.join(df['paper_title'].dropna().astype(str))
-        wordcloud = WordCloud(width=600, height=300, background_color='white', 
-                             max_words=100, colormap='viridis', 
-                             stopwords={'the', 'and', 'of', 'in', 'to', 'a'}).generate(all_titles)
-        plt.imshow(wordcloud, interpolation='bilinear')
-        plt.title('Word Cloud of Paper Titles', fontsize=14, fontweight='bold')
-        plt.axis('off')
-    
-    # Plot 4: Description word count distribution
-    ax4 = plt.subplot(3, 3, 4)
+        data['title_wordcloud'] = token_counts.to_dict(max_words=100)
+        data['top_title_words'] = token_counts.most_common(10)
+    
     if 'description_word_count' in df.columns:
-        plt.hist(df['description_word_count'], bins=30, color='orange', alpha=0.7, edgecolor='darkorange')
-        plt.title('Description Word Count Distribution', fontsize=14, fontweight='bold')
-        plt.xlabel('Word Count')
-        plt.ylabel('Frequency')
-        plt.grid(True, alpha=0.3)
-    
-    # Plot 5: License distribution
-    ax5 = plt.subplot(3, 3, 5)
+        data['description_word_count'] = df['description_word_count'].to_numpy()
+    
     if 'license' in df.columns:
-        license_counts = df['license'].value_counts().head(8)
-        colors = plt.cm.Set3(np.linspace(0, 1, len(license_counts)))
-        plt.pie(license_counts.values, labels=license_counts.index, autopct='%1.1f%%', 
-                startangle=90, colors=colors, textprops={'fontsize': 10})
-        plt.title('Distribution by License Type', fontsize=14, fontweight='bold')
-    
-    # Plot 6: Temporal trend
-    ax6 = plt.subplot(3, 3, 6)
-    if year_cols and len(year_counts) > 1:
-        plt.plot(year_counts.index, year_counts.values, marker='o', linewidth=2, 
-                markersize=6, color='red', alpha=0.7)
-        plt.title('Publication Trend Over Time', fontsize=14, fontweight='bold')
-        plt.xlabel('Year')
-        plt.ylabel('Number of Papers')
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-    
-    # Plot 7: Papers with known vs unknown authors
-    ax7 = plt.subplot(3, 3, 7)
+        license_counts = df['license'].value_counts()
+        data['license_distribution'] = license_counts[license_counts > 0].head(8)
+    
     if 'author_list' in df.columns:
-        known_authors = (df['author_list'] != 'Unknown').sum()
-        unknown_authors = len(df) - known_authors
-        labels = ['Known Authors', 'Unknown Authors']
-        sizes = [known_authors, unknown_authors]
-        colors = ['lightblue', 'lightcoral']
-        plt.pie(sizes, labels=labels, autopct='%1.1f%%', colors=colors, startangle=90)
-        plt.title('Author Information Availability', fontsize=14, fontweight='bold')
-    
-    # Plot 8: Top 10 words in titles (bar chart)
-    ax8 = plt.subplot(3, 3, 8)
-    if 'paper_title' in df.columns:
-        all_titles = ' '.join(df['paper_title'].dropna().astype(str))
-        stop_words = {'the', 'and', 'of', 'in', 'to', 'a', 'for', 'with', 'on', 'as', 'by', 'an', 'at'}
-        title_words = [word.lower() for word in all_titles.split() 
-                      if len(word) > 3 and word.lower() not in stop_words]
-        word_freq = Counter(title_words)
-        top_words = word_freq.most_common(10)
-        
-        words = [word[0] for word in top_words]
-        counts = [word[1] for word in top_words]
-        
-        y_pos = np.arange(len(words))
-        plt.barh(y_pos, counts, color='purple', alpha=0.7)
-        plt.yticks(y_pos, words)
-        plt.title('Top 10 Words in Titles', fontsize=14, fontweight='bold')
-        plt.xlabel('Frequency')
-    
-    # Plot 9: Box plot of word counts
-    ax9 = plt.subplot(3, 3, 9)
+        known_authors = int((df['author_list'] != 'Unknown').sum())
+        data['author_availability'] = [known_authors, len(df) - known_authors]
+    
     word_count_cols = [col for col in df.columns if 'word_count' in col]
     if word_count_cols:
-        word_count_data = [df[col].dropna() for col in word_count_cols]
-        labels = [col.replace('_word_count', '').title() for col in word_count_cols]
-        plt.boxplot(word_count_data, labels=labels)
-        plt.title('Word Count Distribution by Text Type', fontsize=14, fontweight='bold')
-        plt.ylabel('Word Count')
-        plt.xticks(rotation=45)
-    
-    plt.tight_layout()
+        data['word_count_boxplot'] = {
+            col.replace('_word_count', '').title(): df[col].dropna().to_numpy()
+            for col in word_count_cols
+        }
+    return data
+
+def _draw_overview(fig, data):
+    """Draw all available panels into a 3x3 grid on fig"""
+    for position, (name, draw) in enumerate(PANELS, start=1):
+        ax = fig.add_subplot(3, 3, position)
+        if name in data:
+            with stage(name):
+                draw(ax, data[name])
+    fig.tight_layout()
+
+def _render_to_files(name, data, output_dir, formats):
+    """Render one panel (or the overview) to image files; runs in a worker process"""
+    # A bare Figure uses the Agg canvas and never touches pyplot's global state
+    from matplotlib.figure import Figure
+    import os
+    import time
+    
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    _apply_plot_style()
+    if name == 'overview':
+        fig = Figure(figsize=(20, 16))
+        _draw_overview(fig, data)
+    else:
+        fig = Figure(figsize=(8, 6))
+        dict(PANELS)[name](fig.add_subplot(1, 1, 1), data)
+        fig.tight_layout()
+    paths = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f"{name}.{fmt}")
+        fig.savefig(path, format=fmt)
+        paths.append(path)
+    # Worker timings are reported back to the parent's profiler
+    return paths, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+@instrumented()
+def export_visualizations(data, output_dir, formats=('png',), overview=False, workers=None):
+    """Render each panel to its own file in a process pool (headless)"""
+    from concurrent.futures import ProcessPoolExecutor
+    import os
+    
+    os.makedirs(output_dir, exist_ok=True)
+    # Start the slow word cloud first so it overlaps with the cheap panels
+    jobs = sorted(data, key=lambda name: name != 'title_wordcloud')
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_render_to_files, name, data[name], output_dir, formats) for name in jobs]
+        if overview:
+            futures.append(pool.submit(_render_to_files, 'overview', data, output_dir, formats))
+        paths = []
+        for name, future in zip(jobs + ['overview'], futures):
+            panel_paths, wall, cpu = future.result()
+            profiler.add_record(name, wall, cpu, worker=True)
+            paths.extend(panel_paths)
+    return paths
+
+@instrumented()
+def create_visualizations(df, token_counts=None, output_dir=None, formats=('png',), overview=False, workers=None):
+    """Create comprehensive visualizations"""
+    print("\n📈 Generating visualizations...")
+    
+    data = panel_data(df, token_counts)
+    
+    if output_dir is not None:
+        paths = export_visualizations(data, output_dir, formats, overview, workers)
+        print(f"✅ Visualizations exported: {len(paths)} files in {output_dir}")
+        return paths
+    
+    plt = _apply_plot_style()
+    fig = plt.figure(figsize=(20, 16))
+    _draw_overview(fig, data)
     plt.show()
     
     print("✅ Visualizations completed!")
 
+@instrumented()
 def generate_summary_report(df):
-    """Generate a comprehensive summary report"""
+    """Generate a comprehensive summary report (df is a DataFrame or a query backend)"""
+    backend = as_backend(df)
+    columns = backend.columns
     print("\n" + "="*60)
     print("SUMMARY REPORT")
     print("="*60)
     
     print(f"\n📋 Dataset Overview:")
-    print(f"  • Total papers: {len(df):,}")
-    print(f"  • Total columns: {df.shape[1]}")
-    print(f"  • Memory usage: {df.memory_usage(deep=True).sum() / 1024**2:.2f} MB")
+    print(f"  • Total papers: {backend.n_rows:,}")
+    print(f"  • Total columns: {len(columns)}")
+    memory_mb = backend.memory_mb()
+    if memory_mb is not None:
+        print(f"  • Memory usage: {memory_mb:.2f} MB")
+    else:
+        print(f"  • Parquet size on disk ({backend.name}): {backend.storage_mb():.2f} MB")
+    if 'memory_before_compact' in getattr(df, 'attrs', {}):
+        print(f"  • Memory usage before compact dtypes: {df.attrs['memory_before_compact'] / 1024**2:.2f} MB")
     
     # Year summary
-    year_cols = [col for col in df.columns if 'year' in col]
+    year_cols = [col for col in columns if 'year' in col]
     if year_cols:
-        year_data = df[year_cols[0]].dropna()
-        print(f"\n📅 Temporal Analysis:")
-        print(f"  • Coverage: {int(year_data.min())} - {int(year_data.max())}")
-        print(f"  • Most productive year: {year_data.mode().iloc[0] if not year_data.mode().empty else 'N/A'}")
-        print(f"  • Papers with year info: {len(year_data)} ({len(year_data)/len(df)*100:.1f}%)")
+        year_stats = backend.numeric_summary(year_cols[0])
+        if year_stats['count']:
+            most_productive = backend.mode(year_cols[0])
+            print(f"\n📅 Temporal Analysis:")
+            print(f"  • Coverage: {int(year_stats['min'])} - {int(year_stats['max'])}")
+            print(f"  • Most productive year: {most_productive if most_productive is not None else 'N/A'}")
+            print(f"  • Papers with year info: {year_stats['count']} ({year_stats['count']/backend.n_rows*100:.1f}%)")
     
     # Content analysis
     print(f"\n📊 Content Analysis:")
-    if 'description_word_count' in df.columns:
-        desc_stats = df['description_word_count'].describe()
+    if 'description_word_count' in columns:
+        desc_stats = backend.numeric_summary('description_word_count')
         print(f"  • Average description length: {desc_stats['mean']:.1f} words")
         print(f"  • Longest description: {desc_stats['max']:.0f} words")
     
-    if 'paper_title_word_count' in df.columns:
-        title_stats = df['paper_title_word_count'].describe()
+    if 'paper_title_word_count' in columns:
+        title_stats = backend.numeric_summary('paper_title_word_count')
         print(f"  • Average title length: {title_stats['mean']:.1f} words")
     
     # Source diversity
-    if 'source_organization' in df.columns:
-        unique_sources = df['source_organization'].nunique()
+    if 'source_organization' in columns:
+        unique_sources = backend.nunique('source_organization')
         print(f"  • Unique source organizations: {unique_sources}")
     
     print(f"\n✅ Analysis complete! The dataset contains valuable insights into COVID-19 research trends.")
 
-# Main execution
-if __name__ == "__main__":
-    # Load and explore data
-    print("🚀 Starting CORD-19 Dataset Analysis...")
-    df = load_and_explore_data('CORD19 datasets - Sheet 1.csv')
+@instrumented()
+def approx_summary(df, chunksize=100_000):
+    """Sketch a cleaned frame partition by partition and merge the summaries"""
+    summary = ApproxSummary()
+    for start in range(0, len(df), chunksize):
+        summary.merge(ApproxSummary.from_frame(df.iloc[start:start + chunksize]))
+    return summary
+
+def _cleaned_chunks(file_path, chunksize=100_000):
+    """Clean a CSV chunk by chunk; the columns to drop are decided once, from the whole file"""
+    exploration = explore_data_streaming(file_path, chunksize=chunksize)
+    missing_percentage = exploration['missing_percentage']
+    cols_to_drop = missing_percentage[missing_percentage > MISSING_THRESHOLD].index
+    
+    print(f"\nDropped columns (>{MISSING_THRESHOLD}% missing): {cols_to_drop.tolist()}")
+    
+    reader = pd.read_csv(file_path, chunksize=chunksize, usecols=lambda c: c in set(USED_COLUMNS),
+                         dtype=COLUMN_DTYPES)
+    for chunk in reader:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield clean_data(chunk, cols_to_drop=cols_to_drop)
+
+@instrumented()
+def approx_summary_streaming(file_path, chunksize=100_000):
+    """Clean and sketch a CSV chunk by chunk; only one chunk is in memory at a time"""
+    summary = ApproxSummary()
+    for chunk_clean in _cleaned_chunks(file_path, chunksize):
+        summary.merge(ApproxSummary.from_frame(chunk_clean))
+    return summary
+
+@instrumented()
+def load_cleaned_parquet(file_path, chunksize=100_000, rebuild=False, cache_dir=data_cache.CACHE_DIR):
+    """Path of the cleaned data as Parquet for the query backends, streamed from the CSV when missing"""
+    params = cleaning_parameters(chunksize)
+    if not rebuild:
+        parquet_path = data_cache.read_parquet_path(file_path, params, cache_dir)
+        if parquet_path is not None:
+            print(f"⚡ Using cleaned Parquet from cache: {parquet_path}")
+            return parquet_path
+    parquet_path = data_cache.write_parquet(_cleaned_chunks(file_path, chunksize), file_path, params, cache_dir)
+    if parquet_path:
+        print(f"💾 Cleaned data written to {parquet_path}")
+    return parquet_path
+
+def approx_report(summary):
+    """Approximate analysis and summary report from an ApproxSummary, with error bounds"""
+    print("\n" + "="*60)
+    print("APPROXIMATE SUMMARY REPORT (mergeable sketches)")
+    print("="*60)
+    
+    print(f"\n📋 Dataset Overview:")
+    print(f"  • Total papers: {summary.n_rows:,}")
+    
+    # Year counts are exact
+    for year_col, counts in summary.year_counts.items():
+        if counts:
+            years = pd.Series(counts).sort_index()
+            print(f"\n📊 Papers by {year_col}: {int(years.index.min())} - {int(years.index.max())}, "
+                  f"most productive {years.idxmax()} ({years.max():,} papers, exact)")
+    
+    if summary.organizations.estimate() > 0:
+        orgs = summary.top_organizations
+        print(f"\n🏢 Top 15 source organizations (counts may be low by up to {orgs.max_error:,}):")
+        for org, count in orgs.most_common(15):
+            print(f"  {org}: {count} papers")
+        print(f"  • Unique source organizations: ~{summary.organizations.estimate():,.0f} "
+              f"(±{summary.organizations.relative_error:.1%} standard error)")
     
-    # Clean data
-    df_clean = clean_data(df)
+    if summary.known_authors:
+        print(f"\n👥 Papers with known authors: {summary.known_authors:,} "
+              f"({summary.known_authors / summary.n_rows * 100:.1f}%)")
     
-    # Analyze data
-    analyze_data(df_clean)
+    words = summary.title_words
+    if words.n:
+        print(f"\n📝 Top 20 meaningful words in paper titles (counts may be low by up to {words.max_error:,}):")
+        for word, count in words.most_common(20):
+            print(f"  {word}: {count}")
     
-    # Create visualizations
-    create_visualizations(df_clean)
+    if summary.license_counts:
+        print(f"\n📄 Papers by license type:")
+        for license_type, count in sorted(summary.license_counts.items(), key=lambda item: -item[1]):
+            print(f"  {license_type}: {count} papers")
+    
+    for col, sketch in summary.word_counts.items():
+        print(f"\n📊 {col.replace('_', ' ').title()} Statistics (quantile rank error ≤ {sketch.rank_error:.2%}):")
+        print(f"  Mean: {sketch.mean:.1f}")
+        print(f"  Median: {sketch.quantile(0.5):.1f}")
+        print(f"  Quartiles: {sketch.quantile(0.25):.1f} / {sketch.quantile(0.75):.1f}")
+        print(f"  Max: {sketch.max:.1f}")
+        print(f"  Min: {sketch.min:.1f}")
+
+# Main execution
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="CORD-19 metadata analysis")
+    parser.add_argument('file_path', nargs='?', default='CORD19 datasets - Sheet 1.csv',
+                        help="Path to the metadata CSV")
+    parser.add_argument('--chunksize', type=int, default=None,
+                        help="Explore and clean the CSV in chunks of this many rows, so the raw file is never "
+                             "fully loaded (for the full metadata.csv; --incremental still loads the whole release)")
+    parser.add_argument('--compact', action='store_true',
+                        help="Store low-cardinality strings as category and years/word counts as small ints")
+    parser.add_argument('--export-dir', default=None,
+                        help="Render each plot panel to files in this directory instead of showing them")
+    parser.add_argument('--formats', nargs='+', default=['png'],
+                        help="Image formats for --export-dir (e.g. png svg)")
+    parser.add_argument('--overview', action='store_true',
+                        help="With --export-dir, also write the combined 3x3 overview")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes for --export-dir (default: CPU count)")
+    parser.add_argument('--clean-workers', type=int, default=None,
+                        help="Derive the year/word-count columns in this many worker processes")
+    parser.add_argument('--timings', default=None,
+                        help="Record time and memory per stage and write them to this JSON file")
+    parser.add_argument('--cprofile', default=None,
+                        help="Write a cProfile dump of the whole run to this file")
+    parser.add_argument('--rebuild-cache', action='store_true',
+                        help="Ignore the cleaned-data cache and rebuild it from the CSV")
+    parser.add_argument('--cache-dir', default=data_cache.CACHE_DIR,
+                        help="Directory for the cleaned-data cache")
+    parser.add_argument('--no-plots', action='store_true',
+                        help="Text only: exploration, analysis and summary report, without importing the plotting stack")
+    parser.add_argument('--approx', action='store_true',
+                        help="Text-only approximate analysis from mergeable sketches; with --chunksize "
+                             "the CSV is streamed and never fully loaded")
+    parser.add_argument('--backend', choices=['pandas', 'duckdb'], default='pandas',
+                        help="Query backend for the analysis and report; duckdb queries a cleaned Parquet "
+                             "file out of core (text only)")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Only clean rows that are new or changed since the previous release's snapshot")
+    args = parser.parse_args()
+    
+    if args.timings:
+        profiler.enable()
+    if args.cprofile:
+        import cProfile
+        cprofiler = cProfile.Profile()
+        cprofiler.enable()
     
-    # Generate summary report
-    generate_summary_report(df_clean)
+    print("🚀 Starting CORD-19 Dataset Analysis...")
+    if args.approx and args.chunksize:
+        # Stream the CSV through the sketches without loading it whole
+        approx_report(approx_summary_streaming(args.file_path, chunksize=args.chunksize))
+    elif args.backend == 'duckdb':
+        # Clean to Parquet chunk by chunk, then aggregate with SQL over the file
+        parquet_path = load_cleaned_parquet(args.file_path, chunksize=args.chunksize or 100_000,
+                                            rebuild=args.rebuild_cache, cache_dir=args.cache_dir)
+        backend = DuckDBBackend(parquet_path)
+        analyze_data(backend)
+        generate_summary_report(backend)
+    elif args.approx:
+        df_clean = load_cleaned_data(args.file_path, compact=args.compact, rebuild=args.rebuild_cache,
+                                     cache_dir=args.cache_dir, workers=args.clean_workers)
+        approx_report(approx_summary(df_clean))
+    else:
+        # Load, explore and clean data (skipped when the cache is fresh)
+        df_clean = load_cleaned_data(args.file_path, chunksize=args.chunksize, compact=args.compact,
+                                     rebuild=args.rebuild_cache, cache_dir=args.cache_dir,
+                                     workers=args.clean_workers,
+                                     snapshot_dir=incremental.default_snapshot_dir(args.cache_dir) if args.incremental else None)
+        
+        # Tokenize titles once for the analysis and the plots
+        with stage('tokenize_titles'):
+            token_counts = TokenCounts.from_texts(df_clean['paper_title']) if 'paper_title' in df_clean.columns else None
+        
+        # Analyze data
+        analyze_data(df_clean, token_counts)
+        
+        # Create visualizations
+        if not args.no_plots:
+            create_visualizations(df_clean, token_counts, output_dir=args.export_dir, formats=args.formats,
+                                  overview=args.overview, workers=args.workers)
+        
+        # Generate summary report
+        generate_summary_report(df_clean)
+    
+    if args.cprofile:
+        cprofiler.disable()
+        cprofiler.dump_stats(args.cprofile)
+        print(f"\n💾 cProfile dump written to {args.cprofile}")
+    if args.timings:
+        profiler.print_report()
+        profiler.write_report(args.timings)
+        print(f"💾 Stage timings written to {args.timings}")
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+class AggregateCube:
+    """Year x organization x license counts and word-count sums
+
+    Built once from a FilterIndex. Dashboard metrics for any filter selection
+    are sums over a small slice of the cube, so their cost depends on the
+    number of categories rather than the number of rows.
+    """
+
+    def __init__(self, filter_index, word_counts=None):
+        self.filter_index = filter_index
+        self.word_counts = None if word_counts is None else np.asarray(word_counts, dtype='float64')
+        self.years = filter_index.available_years
+        self.organizations = filter_index.organizations
+        self.licenses = filter_index.licenses
+        self._org_lookup = {name: code for code, name in enumerate(self.organizations)}
+        self._license_lookup = {name: code for code, name in enumerate(self.licenses)}
+
+        # Only rows with a year, an organization and a license can pass a filter
+        years = filter_index.years
+        valid = ~np.isnan(years) & (filter_index.org_codes >= 0) & (filter_index.license_codes >= 0)
+        shape = (len(self.years), len(self.organizations), len(self.licenses))
+        cells = np.ravel_multi_index(
+            (np.searchsorted(self.years, years[valid]),
+             filter_index.org_codes[valid],
+             filter_index.license_codes[valid]),
+            shape
+        )
+        size = int(np.prod(shape))
+        self.counts = np.bincount(cells, minlength=size).reshape(shape)
+        self.word_sums = None
+        if self.word_counts is not None:
+            weights = self.word_counts[valid]
+            self.word_sums = np.bincount(cells, weights=weights, minlength=size).reshape(shape)
+
+    def _codes(self, lookup, names):
+        return np.array(sorted({lookup[name] for name in names if name in lookup}), dtype='int64')
+
+    def summarize(self, year_range, organizations, licenses):
+        """Dashboard metrics for a filter selection, from a slice of the cube"""
+        low, high = year_range
+        year_slice = slice(np.searchsorted(self.years, low, side='left'),
+                           np.searchsorted(self.years, high, side='right'))
+        org_codes = self._codes(self._org_lookup, organizations)
+        license_codes = self._codes(self._license_lookup, licenses)
+        counts = self.counts[year_slice][:, org_codes][:, :, license_codes]
+
+        total = int(counts.sum())
+        org_totals = counts.sum(axis=(0, 2))
+        yearly_counts = pd.Series(counts.sum(axis=(1, 2)), index=self.years[year_slice].astype(int), name='count')
+        org_counts = pd.Series(org_totals, index=[self.organizations[c] for c in org_codes], name='count')
+        org_counts = org_counts[org_counts > 0].sort_values(ascending=False, kind='stable')
+
+        mean_word_count = np.nan
+        if self.word_sums is not None and total:
+            word_sums = self.word_sums[year_slice][:, org_codes][:, :, license_codes]
+            mean_word_count = word_sums.sum() / total
+
+        return {
+            'total': total,
+            'yearly_counts': yearly_counts[yearly_counts > 0],
+            'org_counts': org_counts,
+            'unique_organizations': int((org_totals > 0).sum()),
+            'mean_word_count': mean_word_count,
+            # Every cell has a non-null license, so this is the licensed total
+            'papers_with_license': total,
+        }
+
+    def summarize_positions(self, positions):
+        """The same metrics computed from explicit row positions
+
+        Used when a selection cannot be expressed as a cube slice, e.g. after
+        a keyword search. Cost is proportional to the number of positions.
+        """
+        fi = self.filter_index
+        years, year_counts = np.unique(fi.years[positions], return_counts=True)
+        yearly_counts = pd.Series(year_counts, index=years.astype(int), name='count')
+        org_totals = np.bincount(fi.org_codes[positions], minlength=len(self.organizations))
+        org_counts = pd.Series(org_totals, index=self.organizations, name='count')
+        org_counts = org_counts[org_counts > 0].sort_values(ascending=False, kind='stable')
+        mean_word_count = np.nan
+        if self.word_counts is not None and len(positions):
+            mean_word_count = self.word_counts[positions].mean()
+        return {
+            'total': len(positions),
+            'yearly_counts': yearly_counts,
+            'org_counts': org_counts,
+            'unique_organizations': int((org_totals > 0).sum()),
+            'mean_word_count': mean_word_count,
+            'papers_with_license': int((fi.license_codes[positions] >= 0).sum()),
+        }
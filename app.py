@@ -1,39 +1,229 @@
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+import numpy as np
+import os
+import time
 import warnings
+import threading
+from token_counts import TokenCounts
+from filter_index import FilterIndex
+from aggregate_cube import AggregateCube
+from render_cache import LRUCache, artifact_size, render_wordcloud_png
+from search_index import SearchIndex, build_index, tokenize
+from result_view import ResultView
+from instrumentation import peak_rss_mb
+from backends import PandasBackend, DuckDBBackend
+import data_cache
+import incremental
+from Analysis import load_cleaned_data, load_cleaned_parquet, compact_dtypes, cleaning_parameters
 warnings.filterwarnings('ignore')
 
 # Set page config 
 st.set_page_config(page_title="CORD-19 Data Explorer", layout="wide")
 
 # ======== DATA LOADING ========
-@st.cache_data
+DATA_FILE = 'CORD19 datasets - Sheet 1.csv'
+# Backend for the filtered metrics: 'pandas' (aggregate cube in memory) or 'duckdb' (SQL over Parquet)
+QUERY_BACKEND = os.environ.get('CORD19_BACKEND', 'pandas')
+# Memory budget (MB) for the per-filter artifacts shared by all sessions, evicted least recently used first
+CACHE_BUDGET_MB = float(os.environ.get('CORD19_CACHE_MB', 128))
+
 def load_data():
     
-    file_path = 'CORD19 datasets - Sheet 1.csv' 
+    file_path = DATA_FILE 
     
-    # Load  data
-    df_clean = pd.read_csv(CORD19 datasets - Sheet 1.csv)
-  
+    # Show the merged totals of an incremental snapshot built from this file (read-only: only
+    # Analysis.py --incremental updates it); otherwise load the cleaned data (compact dtypes),
+    # memory-mapped from the columnar cache when fresh. A snapshot from either loading
+    # mode will do (chunked runs only keep the used columns).
+    accepted_params = [cleaning_parameters(chunksize) for chunksize in (None, True)]
+    df_clean = incremental.read_snapshot(incremental.default_snapshot_dir(), file_path, accepted_params)
+    if df_clean is not None:
+        df_clean = compact_dtypes(df_clean)
+    else:
+        df_clean = load_cleaned_data(file_path, compact=True)
     
     return df_clean
 
-# Load the data
-try:
-    df_clean = load_data()
-    st.success(f"✅ Loaded CORD-19 data with {len(df_clean)} papers!")
-except FileNotFoundError:
+def create_sample_data():
+    """Create sample data for demonstration"""
+    np.random.seed(42)
+    n_samples = 1000
+    
+    sample_data = {
+        'paper_title': [f'COVID-19 Research Paper {i}' for i in range(n_samples)],
+        'year': np.random.choice([2019, 2020, 2021, 2022], n_samples, p=[0.1, 0.3, 0.4, 0.2]),
+        'source_organization': np.random.choice([
+            'WHO', 'CDC', 'The Lancet', 'Nature', 'Science', 
+            'BMJ', 'JAMA', 'NEJM', 'Elsevier', 'Springer'
+        ], n_samples),
+        'license': np.random.choice([
+            'CC BY', 'CC BY-NC', 'CC BY-ND', 'CC BY-NC-ND', 'CC0'
+        ], n_samples, p=[0.3, 0.2, 0.1, 0.1, 0.3]),
+        'description_word_count': np.random.randint(50, 500, n_samples)
+    }
+    
+    return pd.DataFrame(sample_data)
+
+def default_selection(filter_index):
+    """Filters the sidebar starts with: full year range, first five organizations, all licenses"""
+    years = filter_index.available_years
+    selected_years = (int(min(years)), int(max(years))) if len(years) else (2019, 2022)
+    return selected_years, list(filter_index.organizations[:5]), list(filter_index.licenses)
+
+def load_search_index(df, data_source):
+    """Open the memory-mapped keyword index, building it first if missing or stale"""
+    if data_source == 'csv':
+        index_dir = data_cache.search_index_dir(DATA_FILE)
+        fingerprint = data_cache.source_fingerprint(DATA_FILE, with_hash=False)
+    else:
+        index_dir = data_cache.search_index_dir('sample')
+        fingerprint = {'sample_rows': len(df)}
+    index = SearchIndex.open(index_dir, fingerprint)
+    if index is None:
+        index = build_index(df, index_dir, fingerprint=fingerprint)
+    return index
+
+class DashboardWarmup:
+    """Loads the dataset and builds every dashboard artifact in a background thread
+
+    Also precomputes the default-filter view (positions, metrics, title
+    frequencies and the rendered word cloud) so the first page render only
+    reads warm results. No Streamlit calls are made from the thread.
+    
+    One instance serves every session: the cleaned frame and indexes are
+    shared read-only, and per-filter artifacts live in a single LRU cache
+    bounded by CACHE_BUDGET_MB. Sessions only keep their filter key and page.
+    """
+    
+    STEPS = ['Loading data', 'Tokenizing titles', 'Building filter index', 'Building aggregate cube',
+             'Opening search index', 'Preparing the query backend', 'Precomputing the default view']
+    
+    def __init__(self):
+        self.step = 0
+        self.load_error = None
+        self.error = None
+        self.data_mb = None
+        self.artifacts = LRUCache(max_entries=4096, max_bytes=int(CACHE_BUDGET_MB * 1024**2),
+                                  sizeof=artifact_size)
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='dashboard-warmup', daemon=True)
+        self.thread.start()
+    
+    @property
+    def status(self):
+        return self.STEPS[min(self.step, len(self.STEPS) - 1)]
+    
+    @property
+    def progress(self):
+        return self.step / len(self.STEPS)
+    
+    def _run(self):
+        try:
+            try:
+                self.df_clean = load_data()
+                self.data_source = 'csv'
+            except Exception as e:
+                self.load_error = e
+                self.df_clean = create_sample_data()
+                self.data_source = 'sample'
+            df = self.df_clean
+            self.data_mb = float(df.memory_usage(deep=True).sum()) / 1024**2
+            
+            self.step = 1
+            self.title_counts = TokenCounts.from_texts(df['paper_title']) if 'paper_title' in df.columns else None
+            self.step = 2
+            self.filter_index = FilterIndex(df)
+            self.step = 3
+            word_counts = df['description_word_count'] if 'description_word_count' in df.columns else None
+            self.aggregate_cube = AggregateCube(self.filter_index, word_counts)
+            self.step = 4
+            self.search_index = load_search_index(df, self.data_source)
+            self.step = 5
+            if QUERY_BACKEND == 'duckdb' and self.data_source == 'csv':
+                self.backend = DuckDBBackend(load_cleaned_parquet(DATA_FILE))
+            else:
+                self.backend = PandasBackend(df, self.filter_index, self.aggregate_cube)
+            self.step = 6
+            self._warm_default_view()
+            self.step = 7
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done.set()
+    
+    def _warm_default_view(self):
+        view = self.view(default_selection(self.filter_index))
+        if view['title_freq']:
+            # Rendered into the artifact cache; the page finds it under the same key
+            render_wordcloud_png(view['title_freq'], self.artifacts, width=400, height=200, max_words=50)
+    
+    def _positions(self, selection, search_query):
+        positions = self.filter_index.select(*selection)
+        search_hits = self.search_index.search(search_query)
+        if search_hits is not None:
+            positions = np.intersect1d(positions, search_hits, assume_unique=True)
+        # Shared by every session viewing this filter, so it must not be modified
+        positions.flags.writeable = False
+        return positions
+    
+    def view(self, selection, search_query=''):
+        """Positions, summary and title frequencies for a filter, from the shared artifact cache"""
+        years, orgs, licenses = selection
+        # Queries with the same words share their artifacts
+        search_query = ' '.join(sorted(set(tokenize(search_query))))
+        key = (tuple(years), tuple(orgs), tuple(licenses), search_query)
+        positions = self.artifacts.get_or_compute(('positions', key),
+                                                  lambda: self._positions(selection, search_query))
+        if search_query:
+            compute_summary = lambda: self.aggregate_cube.summarize_positions(positions)
+        else:
+            # Metrics and summary charts come from the query backend (the aggregate cube by default)
+            compute_summary = lambda: self.backend.filtered_summary(years, orgs, licenses)
+        summary = self.artifacts.get_or_compute(('summary', key), compute_summary)
+        if self.title_counts is not None:
+            title_freq = self.artifacts.get_or_compute(
+                ('title_freq', key), lambda: self.title_counts.to_dict(rows=positions, max_words=50))
+        else:
+            title_freq = {}
+        return {'selection': selection, 'positions': positions, 'summary': summary, 'title_freq': title_freq}
+    
+    def metrics(self):
+        """Shared data size, artifact cache statistics and process memory"""
+        return {'data_mb': self.data_mb, 'cache': self.artifacts.stats(), 'peak_rss_mb': peak_rss_mb()}
+
+@st.cache_resource
+def start_warmup():
+    """Start the background warm-up once per server process"""
+    return DashboardWarmup()
+
+# Render straight away; rerun until the warm-up has finished
+warmup = start_warmup()
+if not warmup.done.is_set():
+    st.title("📊 CORD-19 Dataset Explorer")
+    st.progress(warmup.progress, text=f"⏳ Warming up: {warmup.status}...")
+    time.sleep(0.25)
+    st.rerun()
+if warmup.error is not None:
+    st.error(f"❌ Error preparing the dashboard: {warmup.error}")
+    st.stop()
+
+if warmup.load_error is None:
+    st.success(f"✅ Loaded CORD-19 data with {len(warmup.df_clean)} papers!")
+elif isinstance(warmup.load_error, FileNotFoundError):
     st.warning("⚠️ Data file not found. Using sample data instead.")
-    df_clean = create_sample_data()
-except Exception as e:
-    st.error(f"❌ Error loading data: {e}")
+else:
+    st.error(f"❌ Error loading data: {warmup.load_error}")
     st.warning("⚠️ Using sample data instead.")
-    df_clean = create_sample_data()
+
+# Shared, read-only objects: every session reads the same instances
+df_clean = warmup.df_clean
+data_source = warmup.data_source
+filter_index = warmup.filter_index
 # ======== END DATA LOADING ========
 
 def create_streamlit_app():
+    render_start = time.perf_counter()
  
     st.title("📊 CORD-19 Dataset Explorer")
     st.write("Interactive exploration of COVID-19 research papers metadata")
@@ -41,45 +231,45 @@ def create_streamlit_app():
     # Sidebar for filters
     st.sidebar.header("Filters")
     
+    default_years, default_orgs, default_licenses = default_selection(filter_index)
+    
     # Year filter
-    available_years = sorted(df_clean['year'].dropna().unique())
-    if available_years:
+    available_years = filter_index.available_years
+    if len(available_years):
         selected_years = st.sidebar.slider(
             "Select Year Range",
             min_value=int(min(available_years)),
             max_value=int(max(available_years)),
-            value=(int(min(available_years)), int(max(available_years)))
+            value=default_years
         )
     else:
         selected_years = (2019, 2022)
         st.sidebar.warning("No year data available")
     
     # Source organization filter
-    all_organizations = df_clean['source_organization'].dropna().unique()
+    all_organizations = filter_index.organizations
     selected_orgs = st.sidebar.multiselect(
         "Filter by Organization",
         options=all_organizations,
-        default=all_organizations[:5] if len(all_organizations) > 5 else all_organizations
+        default=default_orgs
     )
     
     # License filter
-    all_licenses = df_clean['license'].dropna().unique()
+    all_licenses = filter_index.licenses
     selected_licenses = st.sidebar.multiselect(
         "Filter by License",
         options=all_licenses,
-        default=all_licenses
+        default=default_licenses
     )
     
-    # Filter data based on selection
-    filtered_df = df_clean[
-        (df_clean['year'] >= selected_years[0]) & 
-        (df_clean['year'] <= selected_years[1]) &
-        (df_clean['source_organization'].isin(selected_orgs)) &
-        (df_clean['license'].isin(selected_licenses))
-    ]
+    # Keyword search over titles and abstracts
+    search_query = st.sidebar.text_input("Search titles and abstracts", "")
     
-    # Reset index for display
-    filtered_df = filtered_df.reset_index(drop=True)
+    # Filter data based on selection: row positions into df_clean, no copy.
+    # Positions, metrics and title frequencies are shared with every session using the same filter.
+    selection = (tuple(selected_years), list(selected_orgs), list(selected_licenses))
+    view = warmup.view(selection, search_query)
+    positions, summary, title_freq = view['positions'], view['summary'], view['title_freq']
     
     # Main content
     col1, col2 = st.columns(2)
@@ -90,7 +280,7 @@ def create_streamlit_app():
         # Key metrics
         metric_col1, metric_col2, metric_col3 = st.columns(3)
         with metric_col1:
-            st.metric("Total Papers", len(filtered_df))
+            st.metric("Total Papers", summary['total'])
         with metric_col2:
             st.metric("Years Covered", f"{selected_years[0]} - {selected_years[1]}")
         with metric_col3:
@@ -98,62 +288,71 @@ def create_streamlit_app():
         
         # Publications by year chart
         st.subheader("Publications by Year")
-        if not filtered_df.empty:
-            yearly_counts = filtered_df['year'].value_counts().sort_index()
-            st.bar_chart(yearly_counts)
+        if summary['total']:
+            st.bar_chart(summary['yearly_counts'])
         else:
             st.info("No data available for the selected filters")
     
     with col2:
         st.subheader("Top Source Organizations")
-        if not filtered_df.empty:
-            org_counts = filtered_df['source_organization'].value_counts().head(10)
+        if summary['total']:
+            org_counts = summary['org_counts'].head(10)
             st.dataframe(org_counts, use_container_width=True)
         else:
             st.info("No organizations data available")
         
         # Word cloud
         st.subheader("Paper Titles Word Cloud")
-        if not filtered_df.empty:
-            titles_text = ' '.join(filtered_df['paper_title'].dropna().astype(str))
-            if titles_text.strip():
-                wordcloud = WordCloud(
-                    width=400, 
-                    height=200, 
-                    background_color='white',
-                    colormap='viridis',
-                    max_words=50
-                ).generate(titles_text)
-                fig, ax = plt.subplots(figsize=(10, 5))
-                ax.imshow(wordcloud, interpolation='bilinear')
-                ax.axis('off')
-                st.pyplot(fig)
+        if len(positions):
+            if title_freq:
+                png = render_wordcloud_png(title_freq, warmup.artifacts,
+                                           width=400, height=200, max_words=50)
+                st.image(png, use_container_width=True)
             else:
                 st.info("No title data available for word cloud")
         else:
             st.info("No data available for word cloud")
     
     # Sample data with expandable details
-    st.subheader("Sample Papers")
-    if not filtered_df.empty:
-        display_columns = ['paper_title', 'year', 'source_organization', 'license']
-        available_columns = [col for col in display_columns if col in filtered_df.columns]
+    st.subheader("Papers")
+    results = ResultView(df_clean, positions, columns=['paper_title', 'year', 'source_organization', 'license'])
+    if len(results):
+        # Start from the first page whenever the selection changes
+        selection_key = (selected_years, tuple(selected_orgs), tuple(selected_licenses), search_query)
+        if st.session_state.get('results_key') != selection_key:
+            st.session_state['results_key'] = selection_key
+            st.session_state['results_page'] = 0
+        page_size = 10
+        n_pages = results.n_pages(page_size)
+        page = min(st.session_state.get('results_page', 0), n_pages - 1)
+        
+        prev_col, info_col, next_col = st.columns([1, 3, 1])
+        with prev_col:
+            if st.button("◀ Previous", disabled=page == 0):
+                page -= 1
+        with next_col:
+            if st.button("Next ▶", disabled=page >= n_pages - 1):
+                page += 1
+        st.session_state['results_page'] = page
+        with info_col:
+            st.write(f"Page {page + 1} of {n_pages} ({len(results):,} papers)")
         
-        sample_data = filtered_df[available_columns].head(10)
-        st.dataframe(sample_data, use_container_width=True)
+        page_data = results.page(page, page_size)
+        st.dataframe(page_data, use_container_width=True)
         
         # Show detailed view for selected paper
-        if len(sample_data) > 0:
+        if len(page_data) > 0:
             st.subheader("Paper Details")
+            titles = page_data['paper_title'].astype(str).fillna('') if 'paper_title' in page_data.columns else page_data.index.astype(str)
             selected_index = st.selectbox(
                 "Select a paper to view details:",
-                options=range(len(sample_data)),
-                format_func=lambda x: f"{sample_data.iloc[x]['paper_title'][:80]}..." if len(sample_data.iloc[x]['paper_title']) > 80 else sample_data.iloc[x]['paper_title']
+                options=page_data.index,
+                format_func=lambda x: f"{titles[x][:80]}..." if len(titles[x]) > 80 else titles[x]
             )
             
-            selected_paper = filtered_df.iloc[selected_index]
+            selected_paper = results.record(selected_index)
             with st.expander("View Paper Details", expanded=False):
-                for col in filtered_df.columns:
+                for col in df_clean.columns:
                     if pd.notna(selected_paper[col]):
                         st.write(f"**{col.replace('_', ' ').title()}:** {selected_paper[col]}")
     else:
@@ -161,60 +360,66 @@ def create_streamlit_app():
     
     # Additional statistics
     st.subheader("Additional Statistics")
-    if not filtered_df.empty:
+    if summary['total']:
         col3, col4, col5, col6 = st.columns(4)
         
         with col3:
-            if 'description_word_count' in filtered_df.columns:
-                avg_word_count = filtered_df['description_word_count'].mean()
+            if 'description_word_count' in df_clean.columns:
+                avg_word_count = summary['mean_word_count']
                 st.metric("Avg Description Words", f"{avg_word_count:.1f}")
             else:
-                st.metric("Papers Count", len(filtered_df))
+                st.metric("Papers Count", summary['total'])
         
         with col4:
-            unique_orgs = filtered_df['source_organization'].nunique()
+            unique_orgs = summary['unique_organizations']
             st.metric("Unique Organizations", unique_orgs)
         
         with col5:
-            papers_with_license = filtered_df['license'].notna().sum()
+            papers_with_license = summary['papers_with_license']
             st.metric("Papers with License", papers_with_license)
         
         with col6:
-            recent_year_count = filtered_df[filtered_df['year'] == selected_years[1]]['year'].count()
+            recent_year_count = int(summary['yearly_counts'].get(selected_years[1], 0))
             st.metric(f"Papers in {selected_years[1]}", recent_year_count)
     
     # Data export
     st.sidebar.header("Data Export")
-    if st.sidebar.button("Download Filtered Data as CSV"):
-        csv = filtered_df.to_csv(index=False)
-        st.sidebar.download_button(
-            label="Download CSV",
-            data=csv,
-            file_name=f"cord19_filtered_{selected_years[0]}_{selected_years[1]}.csv",
-            mime="text/csv"
-        )
-
-def create_sample_data():
-    """Create sample data for demonstration"""
-    import numpy as np
-    
-    np.random.seed(42)
-    n_samples = 1000
-    
-    sample_data = {
-        'paper_title': [f'COVID-19 Research Paper {i}' for i in range(n_samples)],
-        'year': np.random.choice([2019, 2020, 2021, 2022], n_samples, p=[0.1, 0.3, 0.4, 0.2]),
-        'source_organization': np.random.choice([
-            'WHO', 'CDC', 'The Lancet', 'Nature', 'Science', 
-            'BMJ', 'JAMA', 'NEJM', 'Elsevier', 'Springer'
-        ], n_samples),
-        'license': np.random.choice([
-            'CC BY', 'CC BY-NC', 'CC BY-ND', 'CC BY-NC-ND', 'CC0'
-        ], n_samples, p=[0.3, 0.2, 0.1, 0.1, 0.3]),
-        'description_word_count': np.random.randint(50, 500, n_samples)
-    }
+    # The CSV is written in chunks to a temporary file only when clicked
+    st.sidebar.download_button(
+        label="Download Filtered Data as CSV",
+        data=results.to_csv_file,
+        file_name=f"cord19_filtered_{selected_years[0]}_{selected_years[1]}.csv",
+        mime="text/csv"
+    )
     
-    return pd.DataFrame(sample_data)
+    warmup.artifacts.record_latency('page', time.perf_counter() - render_start)
+    show_resource_metrics(warmup.metrics())
+
+def show_resource_metrics(metrics):
+    """Sidebar panel with the shared cache hit rates, sizes and render latencies"""
+    cache = metrics['cache']
+    with st.sidebar.expander("📈 Resource metrics", expanded=False):
+        st.write(f"**Shared data:** {metrics['data_mb']:.1f} MB (one copy for all sessions)")
+        st.write(f"**Artifact cache:** {cache['bytes'] / 1024**2:.1f} of {cache['max_bytes'] / 1024**2:.0f} MB, "
+                 f"{cache['entries']} entries, {cache['evictions']} evictions")
+        if cache['hit_rate'] is not None:
+            st.write(f"**Hit rate:** {cache['hit_rate']:.1%} ({cache['hits']} hits, {cache['misses']} misses)")
+        if metrics['peak_rss_mb'] is not None:
+            st.write(f"**Peak process memory:** {metrics['peak_rss_mb']:.0f} MB")
+        rows = []
+        for kind, stats in sorted(cache['kinds'].items()):
+            latency = stats['latency_ms']
+            rows.append({
+                'artifact': kind,
+                'entries': stats['entries'],
+                'MB': round(stats['bytes'] / 1024**2, 2),
+                'hit rate': f"{stats['hit_rate']:.0%}" if stats['hit_rate'] is not None else '',
+                'mean ms': round(latency['mean'], 1) if latency['mean'] is not None else None,
+                'p95 ms': round(latency['p95'], 1) if latency['p95'] is not None else None,
+                'max ms': round(latency['max'], 1) if latency['max'] is not None else None,
+            })
+        if rows:
+            st.dataframe(pd.DataFrame(rows).set_index('artifact'), use_container_width=True)
 
 # Run the Streamlit app
 if __name__ == "__main__":
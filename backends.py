@@ -0,0 +1,292 @@
+import os
+import math
+import numpy as np
+import pandas as pd
+
+from token_counts import TokenCounts, STOP_WORDS
+from filter_index import FilterIndex
+from aggregate_cube import AggregateCube
+
+# Both backends order counts by count (descending), then by value, so their results compare equal
+def _sorted_counts(counts):
+    counts = counts[counts > 0]
+    frame = pd.DataFrame({'value': counts.index.astype('object'), 'count': counts.to_numpy(dtype='int64')})
+    frame = frame.sort_values(['count', 'value'], ascending=[False, True], kind='stable')
+    return pd.Series(frame['count'].to_numpy(), index=pd.Index(frame['value'].to_numpy(), dtype='object'),
+                     name='count')
+
+def _summary(total, yearly_counts, org_counts, mean_word_count):
+    return {
+        'total': int(total),
+        'yearly_counts': yearly_counts,
+        'org_counts': org_counts,
+        'unique_organizations': int((org_counts > 0).sum()),
+        'mean_word_count': mean_word_count,
+        'papers_with_license': int(total),
+    }
+
+class PandasBackend:
+    """Aggregation queries over an in-memory DataFrame (the default backend)"""
+
+    name = 'pandas'
+
+    def __init__(self, df, filter_index=None, aggregate_cube=None, token_counts=None):
+        self.df = df
+        self.columns = list(df.columns)
+        self.n_rows = len(df)
+        self._filter_index = filter_index
+        self._aggregate_cube = aggregate_cube
+        # Precomputed TokenCounts of paper_title, reused by top_words
+        self._token_counts = token_counts
+
+    def counts(self, col, limit=None):
+        return _sorted_counts(self.df[col].value_counts()).head(limit)
+
+    def year_counts(self, col):
+        years = self.df[col].dropna()
+        counts = years.astype('int64').value_counts().sort_index()
+        return pd.Series(counts.to_numpy(dtype='int64'), index=counts.index.to_numpy(dtype='int64'), name='count')
+
+    def month_counts(self, col):
+        months = self.df[col].dropna().dt.strftime('%Y-%m')
+        counts = months.value_counts().sort_index()
+        return pd.Series(counts.to_numpy(dtype='int64'), index=pd.Index(counts.index.to_numpy(dtype='object')), name='count')
+
+    def count_not_equal(self, col, value):
+        return int((self.df[col] != value).sum())
+
+    def numeric_summary(self, col):
+        values = self.df[col].dropna().astype('float64')
+        if len(values) == 0:
+            return {'count': 0, 'mean': np.nan, 'median': np.nan, 'min': np.nan, 'max': np.nan}
+        return {'count': len(values), 'mean': values.mean(), 'median': values.median(),
+                'min': values.min(), 'max': values.max()}
+
+    def mode(self, col):
+        """Most frequent value (the smallest one on ties), None if the column is empty"""
+        modes = self.df[col].mode()
+        return modes.iloc[0] if len(modes) else None
+
+    def nunique(self, col):
+        return int(self.df[col].nunique())
+
+    def top_words(self, col, n):
+        token_counts = self._token_counts if col == 'paper_title' and self._token_counts is not None else None
+        if token_counts is None:
+            token_counts = TokenCounts.from_texts(self.df[col])
+        counts = pd.Series(dict(token_counts.most_common()), dtype='int64')
+        return list(_sorted_counts(counts).head(n).items())
+
+    def memory_mb(self):
+        return self.df.memory_usage(deep=True).sum() / 1024**2
+
+    def filtered_summary(self, year_range, organizations, licenses, word_col='description_word_count'):
+        """Dashboard metrics for a filter selection, from the aggregate cube"""
+        if self._aggregate_cube is None:
+            if self._filter_index is None:
+                self._filter_index = FilterIndex(self.df)
+            word_counts = self.df[word_col] if word_col in self.columns else None
+            self._aggregate_cube = AggregateCube(self._filter_index, word_counts)
+        summary = self._aggregate_cube.summarize(year_range, organizations, licenses)
+        summary['org_counts'] = _sorted_counts(summary['org_counts'])
+        summary['yearly_counts'] = summary['yearly_counts'].astype('int64')
+        return summary
+
+class DuckDBBackend:
+    """The same aggregation queries as SQL over a Parquet file, run by embedded DuckDB
+
+    The file is queried in place (out of core); only the small results are
+    materialized as pandas objects.
+    """
+
+    name = 'duckdb'
+
+    def __init__(self, parquet_path):
+        # Imported here so importing the backends (Analysis, app) does not load duckdb
+        try:
+            import duckdb
+        except ImportError:  # only the pandas backend is available without duckdb
+            raise ImportError("the DuckDB backend requires the duckdb package") from None
+        self.parquet_path = parquet_path
+        self.con = duckdb.connect()
+        path = parquet_path.replace("'", "''")
+        self.con.execute(f"CREATE VIEW papers AS SELECT * FROM read_parquet('{path}')")
+        self.columns = [row[0] for row in self._query("DESCRIBE papers").itertuples(index=False)]
+        self.n_rows = int(self._scalar("SELECT count(*) FROM papers"))
+
+    def _query(self, sql, params=None):
+        # A cursor per query: DuckDB connections must not be shared between threads
+        return self.con.cursor().execute(sql, params or []).df()
+
+    def _scalar(self, sql, params=None):
+        return self.con.cursor().execute(sql, params or []).fetchone()[0]
+
+    @staticmethod
+    def _column(col):
+        return '"' + col.replace('"', '""') + '"'
+
+    def counts(self, col, limit=None):
+        c = self._column(col)
+        result = self._query(f"SELECT {c} AS value, count(*) AS n FROM papers WHERE {c} IS NOT NULL "
+                             f"GROUP BY 1 ORDER BY n DESC, value ASC" + (f" LIMIT {int(limit)}" if limit else ""))
+        return pd.Series(result['n'].to_numpy(dtype='int64'), index=pd.Index(result['value'].to_numpy(dtype='object')),
+                         name='count')
+
+    def year_counts(self, col):
+        c = self._column(col)
+        result = self._query(f"SELECT CAST({c} AS BIGINT) AS year, count(*) AS n FROM papers "
+                             f"WHERE {c} IS NOT NULL GROUP BY 1 ORDER BY 1")
+        return pd.Series(result['n'].to_numpy(dtype='int64'), index=result['year'].to_numpy(dtype='int64'),
+                         name='count')
+
+    def month_counts(self, col):
+        c = self._column(col)
+        result = self._query(f"SELECT strftime({c}, '%Y-%m') AS month, count(*) AS n FROM papers "
+                             f"WHERE {c} IS NOT NULL GROUP BY 1 ORDER BY 1")
+        return pd.Series(result['n'].to_numpy(dtype='int64'), index=pd.Index(result['month'].to_numpy(dtype='object')),
+                         name='count')
+
+    def count_not_equal(self, col, value):
+        return int(self._scalar(f"SELECT count(*) FROM papers WHERE {self._column(col)} IS DISTINCT FROM ?", [value]))
+
+    def numeric_summary(self, col):
+        c = self._column(col)
+        count, mean, median, low, high = self.con.cursor().execute(
+            f"SELECT count({c}), avg({c}), median(CAST({c} AS DOUBLE)), min({c}), max({c}) FROM papers").fetchone()
+        nan_if_none = lambda v: np.nan if v is None else float(v)
+        return {'count': int(count), 'mean': nan_if_none(mean), 'median': nan_if_none(median),
+                'min': nan_if_none(low), 'max': nan_if_none(high)}
+
+    def mode(self, col):
+        c = self._column(col)
+        row = self.con.cursor().execute(f"SELECT {c} FROM papers WHERE {c} IS NOT NULL GROUP BY 1 "
+                                        f"ORDER BY count(*) DESC, 1 ASC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    def nunique(self, col):
+        return int(self._scalar(f"SELECT count(DISTINCT {self._column(col)}) FROM papers"))
+
+    def top_words(self, col, n, min_length=4):
+        """Title words as TokenCounts counts them (whitespace split, lower-cased, no stop words)"""
+        c = self._column(col)
+        result = self._query(
+            f"WITH words AS (SELECT unnest(regexp_split_to_array(trim({c}), '\\s+')) AS word "
+            f"FROM papers WHERE {c} IS NOT NULL) "
+            f"SELECT lower(word) AS word, count(*) AS n FROM words "
+            f"WHERE length(word) >= ? AND NOT list_contains(?, lower(word)) "
+            f"GROUP BY 1 ORDER BY n DESC, word ASC LIMIT ?",
+            [min_length, sorted(STOP_WORDS), n])
+        return [(word, int(count)) for word, count in zip(result['word'], result['n'])]
+
+    def memory_mb(self):
+        """Data lives on disk; nothing is held in memory"""
+        return None
+
+    def storage_mb(self):
+        return os.path.getsize(self.parquet_path) / 1024**2
+
+    def filtered_summary(self, year_range, organizations, licenses, word_col='description_word_count',
+                         year_col='year', org_col='source_organization', license_col='license'):
+        """Dashboard metrics for a filter selection, as one grouped SQL query"""
+        empty = pd.Series([], dtype='int64', name='count')
+        if not len(organizations) or not len(licenses):
+            return _summary(0, empty, pd.Series([], index=pd.Index([], dtype='object'), dtype='int64', name='count'),
+                            np.nan)
+        year, org, lic = self._column(year_col), self._column(org_col), self._column(license_col)
+        words = f"sum({self._column(word_col)})" if word_col in self.columns else "NULL"
+        result = self._query(
+            f"SELECT CAST({year} AS BIGINT) AS year, {org} AS org, count(*) AS n, {words} AS words "
+            f"FROM papers WHERE {year} BETWEEN ? AND ? AND list_contains(?, {org}) AND list_contains(?, {lic}) "
+            f"GROUP BY 1, 2",
+            [year_range[0], year_range[1], [str(o) for o in organizations], [str(l) for l in licenses]])
+        total = int(result['n'].sum())
+        yearly_counts = result.groupby('year')['n'].sum().sort_index()
+        yearly_counts = pd.Series(yearly_counts.to_numpy(dtype='int64'), index=yearly_counts.index.to_numpy(dtype='int64'),
+                                  name='count')
+        org_counts = _sorted_counts(result.groupby('org')['n'].sum())
+        mean_word_count = np.nan
+        if word_col in self.columns and total:
+            mean_word_count = float(result['words'].astype('float64').sum()) / total
+        return _summary(total, yearly_counts, org_counts, mean_word_count)
+
+def as_backend(data, token_counts=None):
+    """A DataFrame is wrapped in the pandas backend; backends pass through"""
+    return PandasBackend(data, token_counts=token_counts) if isinstance(data, pd.DataFrame) else data
+
+def _same(a, b):
+    if isinstance(a, pd.Series):
+        return (isinstance(b, pd.Series) and len(a) == len(b) and list(a.index) == list(b.index)
+                and np.allclose(a.to_numpy(dtype='float64'), b.to_numpy(dtype='float64')))
+    if isinstance(a, dict):
+        return isinstance(b, dict) and a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, float) or isinstance(b, float):
+        if a is None or b is None:
+            return a is b
+        return (math.isnan(a) and math.isnan(b)) or math.isclose(a, b, rel_tol=1e-9)
+    return a == b
+
+def check_parity(backend, reference, selections=()):
+    """Run every backend query on both backends; returns the names of mismatching queries
+
+    This is the shared check for backends: any new backend must give the
+    same results as the pandas reference on the same cleaned data.
+    """
+    columns = reference.columns
+    queries = {'n_rows': lambda b: b.n_rows, 'columns': lambda b: sorted(b.columns)}
+    for col in [c for c in columns if 'year' in c]:
+        queries[f'year_counts({col})'] = lambda b, col=col: b.year_counts(col)
+        queries[f'numeric_summary({col})'] = lambda b, col=col: b.numeric_summary(col)
+        queries[f'mode({col})'] = lambda b, col=col: b.mode(col)
+    for col in [c for c in columns if c.endswith('_datetime')]:
+        queries[f'month_counts({col})'] = lambda b, col=col: b.month_counts(col)
+    for col in [c for c in columns if c.endswith('_word_count')]:
+        queries[f'numeric_summary({col})'] = lambda b, col=col: b.numeric_summary(col)
+    for col in [c for c in ['source_organization', 'license'] if c in columns]:
+        queries[f'counts({col})'] = lambda b, col=col: b.counts(col)
+        queries[f'nunique({col})'] = lambda b, col=col: b.nunique(col)
+    if 'author_list' in columns:
+        queries['count_not_equal(author_list)'] = lambda b: b.count_not_equal('author_list', 'Unknown')
+    if 'paper_title' in columns:
+        queries['top_words(paper_title)'] = lambda b: b.top_words('paper_title', 50)
+    for i, selection in enumerate(selections):
+        queries[f'filtered_summary[{i}]'] = lambda b, selection=selection: b.filtered_summary(*selection)
+
+    mismatches = []
+    for name, query in queries.items():
+        if not _same(query(reference), query(backend)):
+            mismatches.append(name)
+    return mismatches
+
+def default_selections(df):
+    """A few dashboard filter selections to compare backends on"""
+    filter_index = FilterIndex(df)
+    years = filter_index.available_years
+    if not len(years):
+        return []
+    full = (int(years.min()), int(years.max()))
+    orgs, licenses = filter_index.organizations, filter_index.licenses
+    return [
+        (full, orgs[:5], licenses),
+        (full, orgs, licenses[:1]),
+        ((full[1], full[1]), orgs[::2], licenses),
+        (full, [], licenses),
+    ]
+
+if __name__ == "__main__":
+    import sys
+    import argparse
+    import data_cache
+    from Analysis import load_cleaned_data, load_cleaned_parquet
+
+    parser = argparse.ArgumentParser(description="Check that the DuckDB backend matches the pandas backend")
+    parser.add_argument('file_path', nargs='?', default='CORD19 datasets - Sheet 1.csv')
+    parser.add_argument('--cache-dir', default=data_cache.CACHE_DIR)
+    args = parser.parse_args()
+
+    df_clean = load_cleaned_data(args.file_path, chunksize=100_000, cache_dir=args.cache_dir)
+    parquet_path = load_cleaned_parquet(args.file_path, chunksize=100_000, cache_dir=args.cache_dir)
+    mismatches = check_parity(DuckDBBackend(parquet_path), PandasBackend(df_clean), default_selections(df_clean))
+    if mismatches:
+        print(f"❌ Backends differ on: {', '.join(mismatches)}")
+        sys.exit(1)
+    print("✅ DuckDB and pandas backends return identical results")
@@ -0,0 +1,246 @@
+import io
+import json
+import time
+import argparse
+import platform
+import subprocess
+import contextlib
+from datetime import datetime, timezone
+import numpy as np
+import pandas as pd
+
+import Analysis
+import date_parsing
+from token_counts import TokenCounts
+from filter_index import FilterIndex
+from aggregate_cube import AggregateCube
+
+# Vocabularies for the synthetic CORD-19-shaped data
+TITLE_WORDS = (
+    'covid-19 sars-cov-2 coronavirus pandemic outbreak patients clinical characteristics '
+    'transmission dynamics model analysis infection respiratory severe acute syndrome '
+    'hospitalized cohort study retrospective systematic review meta-analysis vaccine '
+    'antibody response immune treatment outcomes mortality risk factors china wuhan '
+    'italy novel viral pneumonia epidemic public health impact mental healthcare workers '
+    'lockdown social distancing testing diagnosis ct imaging children pregnant women '
+    'protein spike receptor ace2 binding structure genome sequencing variants'
+).split()
+STOP_WORDS = 'the of and in a to for with on by an at as from during among'.split()
+ABSTRACT_WORDS = TITLE_WORDS + STOP_WORDS * 3 + (
+    'we results methods conclusions background objective were was is are this these '
+    'significant significantly associated compared higher lower increased reduced data '
+    'using based total included reported observed median age years days confidence interval'
+).split()
+ORGANIZATIONS = [
+    'Elsevier', 'Springer', 'PMC', 'medRxiv', 'bioRxiv', 'WHO', 'The Lancet', 'Nature',
+    'BMJ', 'JAMA', 'NEJM', 'Wiley', 'MDPI', 'Frontiers', 'PLoS', 'Oxford', 'Cambridge',
+    'Science', 'Cell Press', 'SAGE', 'Taylor & Francis', 'ACS', 'IEEE', 'arXiv', 'CDC',
+] + [f'Publisher {i}' for i in range(175)]
+LICENSES = ['els-covid', 'cc-by', 'no-cc', 'cc-by-nc-nd', 'cc-by-nc', 'medrxiv', 'biorxiv',
+            'cc0', 'cc-by-nd', 'arxiv', 'cc-by-sa', 'hybrid-oa']
+DATE_FORMATS = ['%Y-%m-%d', '%Y/%m/%d', '%d %B %Y', '%b %Y', '%Y', '%Y-%m-%dT%H:%M:%SZ', '%m/%d/%Y']
+JUNK_DATES = ['n/a', 'unknown', '', '2345-covid', '0000-00-00', 'in press']
+
+# Share of missing values per column (roughly the real metadata.csv)
+MISSING_RATES = {
+    'paper_title': 0.01,
+    'description': 0.25,
+    'abstract': 0.2,
+    'author_list': 0.03,
+    'source_organization': 0.05,
+    'license': 0.02,
+    'last_updated': 0.1,
+    'publication_date': 0.05,
+    'date': 0.6,
+    'year': 0.05,
+}
+
+def _zipf_choice(rng, options, n, exponent=1.2):
+    """Sample options with a Zipf-like skew (first options most common)"""
+    weights = 1.0 / np.arange(1, len(options) + 1) ** exponent
+    return np.asarray(options, dtype='object')[rng.choice(len(options), n, p=weights / weights.sum())]
+
+def _text_pool(rng, vocabulary, size, min_words, max_words):
+    """Distinct random texts to sample rows from"""
+    vocabulary = np.asarray(vocabulary, dtype='object')
+    lengths = rng.integers(min_words, max_words + 1, size)
+    words = rng.choice(vocabulary, lengths.sum())
+    bounds = np.concatenate([[0], np.cumsum(lengths)])
+    texts = [' '.join(words[bounds[i]:bounds[i + 1]]) for i in range(size)]
+    # Mostly sentence-case titles with the odd messy whitespace
+    return np.array([t.capitalize() if i % 7 else t.replace(' ', '  ', 1) for i, t in enumerate(texts)],
+                    dtype='object')
+
+def _date_pool(rng, size):
+    """Distinct messy date strings, skewed towards the pandemic years"""
+    years = rng.choice(np.arange(1990, 2024), size, p=_year_weights())
+    days = rng.integers(0, 365, size)
+    stamps = pd.to_datetime(years.astype(str), format='%Y') + pd.to_timedelta(days, unit='D')
+    formats = rng.choice(DATE_FORMATS, size)
+    dates = [stamp.strftime(fmt) for stamp, fmt in zip(stamps, formats)]
+    junk = rng.random(size) < 0.02
+    dates = np.array(dates, dtype='object')
+    dates[junk] = rng.choice(JUNK_DATES, junk.sum())
+    return dates
+
+def _year_weights():
+    years = np.arange(1990, 2024)
+    weights = np.where(years >= 2020, 40.0, 1.0) * np.where(years == 2021, 1.5, 1.0)
+    return weights / weights.sum()
+
+def generate_cord19_frame(n_rows, seed=42, missing_rates=None, pool_size=20_000):
+    """Synthetic frame with CORD-19-shaped columns, skew and missing values
+
+    Texts and dates are drawn from pools of pool_size distinct values, so
+    generating 10M rows stays cheap while keeping realistic repetition.
+    """
+    rng = np.random.default_rng(seed)
+    missing_rates = {**MISSING_RATES, **(missing_rates or {})}
+    pool = min(pool_size, max(n_rows, 1))
+
+    titles = _text_pool(rng, TITLE_WORDS + STOP_WORDS, pool, 5, 20)
+    descriptions = _text_pool(rng, ABSTRACT_WORDS, pool, 20, 80)
+    abstracts = _text_pool(rng, ABSTRACT_WORDS, pool, 100, 300)
+    authors = np.array([f'Author {i}; Author {i + 1}' for i in range(pool)], dtype='object')
+    dates = _date_pool(rng, pool)
+
+    df = pd.DataFrame({
+        'paper_title': titles[rng.integers(0, pool, n_rows)],
+        'description': descriptions[rng.integers(0, pool, n_rows)],
+        'abstract': abstracts[rng.integers(0, pool, n_rows)],
+        'author_list': authors[rng.integers(0, pool, n_rows)],
+        'source_organization': _zipf_choice(rng, ORGANIZATIONS, n_rows),
+        'license': _zipf_choice(rng, LICENSES, n_rows, exponent=1.5),
+        'last_updated': dates[rng.integers(0, pool, n_rows)],
+        'publication_date': dates[rng.integers(0, pool, n_rows)],
+        'date': dates[rng.integers(0, pool, n_rows)],
+        'year': rng.choice(np.arange(1990, 2024), n_rows, p=_year_weights()).astype('float64'),
+    })
+    for col, rate in missing_rates.items():
+        if col in df.columns and rate > 0:
+            df.loc[rng.random(n_rows) < rate, col] = np.nan
+    return df
+
+def _time(func, repeat):
+    """Best wall time of func() over repeat runs"""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def _quiet(func):
+    """Run func with its report printing suppressed"""
+    def wrapper():
+        with contextlib.redirect_stdout(io.StringIO()):
+            return func()
+    return wrapper
+
+def bench_clean_data(n_rows=200_000, repeat=3):
+    """Compare the apply-based and column-level derived-column paths"""
+    df = generate_cord19_frame(n_rows)
+    results = {}
+
+    for col in ['last_updated', 'publication_date']:
+        print(f"\n📅 Date formats in {col}: {date_parsing.DateParser().detect_formats(df[col]).to_dict()}")
+        t_apply, _ = _time(lambda: df[col].apply(Analysis.extract_year), repeat)
+        t_cell, expected = _time(lambda: df[col].apply(date_parsing.parse_date).astype(date_parsing.DATETIME_DTYPE),
+                                 repeat)
+        # A fresh parser per run, so the string cache does not carry over between repeats
+        t_vec, actual = _time(lambda: date_parsing.DateParser().parse(df[col]), repeat)
+        pd.testing.assert_series_equal(actual, expected)
+        results[f'{col}_datetime'] = {'apply extract_year': t_apply, 'apply parse_date': t_cell,
+                                      'DateParser': t_vec}
+
+    for col in ['paper_title', 'description', 'abstract']:
+        t_apply, expected = _time(lambda: df[col].apply(Analysis.get_word_count), repeat)
+        t_vec, actual = _time(lambda: Analysis.count_words(df[col]), repeat)
+        pd.testing.assert_series_equal(actual, expected)
+        results[f'{col}_word_count'] = {'apply': t_apply, 'column-level': t_vec}
+
+    print(f"\n⏱️ clean_data derived columns ({n_rows:,} rows, best of {repeat}):")
+    for name, timings in results.items():
+        baseline = next(iter(timings.values()))
+        print(f"  {name}: " + ", ".join(f"{path} {seconds*1000:.1f} ms ({baseline / seconds:.1f}x)"
+                                        for path, seconds in timings.items()))
+    return results
+
+def _dashboard_filter(df_clean, repeat):
+    """Time the dashboard's index build and a default-filter interaction"""
+    build, filter_index = _time(lambda: FilterIndex(df_clean), repeat)
+    cube_build, cube = _time(lambda: AggregateCube(filter_index, df_clean.get('description_word_count')), repeat)
+    years = filter_index.available_years
+    selection = ((int(years.min()), int(years.max())), filter_index.organizations[:5], filter_index.licenses)
+
+    def interact():
+        positions = filter_index.select(*selection)
+        summary = cube.summarize(*selection)
+        return len(positions), summary['total']
+
+    interaction, _ = _time(interact, repeat)
+    return {'filter_index_build': build, 'aggregate_cube_build': cube_build, 'filter_interaction': interaction}
+
+def bench_scale(n_rows, repeat=3, seed=42):
+    """Time the main pipeline stages on a synthetic frame of n_rows"""
+    df = generate_cord19_frame(n_rows, seed=seed)
+    timings = {}
+
+    def clean():
+        # The shared parser's string cache would otherwise carry over between repeats and scales
+        date_parsing.date_parser.clear_cache()
+        return Analysis.clean_data(df)
+
+    timings['clean_data'], df_clean = _time(_quiet(clean), repeat)
+    timings['token_counts'], token_counts = _time(lambda: TokenCounts.from_texts(df_clean['paper_title']), repeat)
+    timings['analyze_data'], _ = _time(_quiet(lambda: Analysis.analyze_data(df_clean, token_counts)), repeat)
+    timings.update(_dashboard_filter(df_clean, repeat))
+    timings['generate_summary_report'], _ = _time(_quiet(lambda: Analysis.generate_summary_report(df_clean)), repeat)
+    return timings
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(scales, repeat=3, seed=42, output=None):
+    """Benchmark every scale and optionally write machine-readable results"""
+    results = {
+        'commit': _git_commit(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeat': repeat,
+        'seed': seed,
+        'scales': {},
+    }
+    for n_rows in scales:
+        print(f"\n⏱️ Benchmarking {n_rows:,} rows (best of {repeat})...")
+        timings = bench_scale(n_rows, repeat, seed)
+        results['scales'][str(n_rows)] = timings
+        for name, seconds in timings.items():
+            print(f"  {name}: {seconds*1000:.1f} ms")
+
+    if output:
+        with open(output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {output}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CORD-19 pipeline benchmarks")
+    parser.add_argument('--scales', type=int, nargs='+', default=[10_000, 100_000, 1_000_000],
+                        help="Row counts to benchmark (e.g. 10000 100000 1000000 10000000)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default=None, help="Write results as JSON to this file")
+    parser.add_argument('--compare-apply', type=int, default=None, metavar='ROWS',
+                        help="Also compare the apply-based clean_data columns at this many rows")
+    args = parser.parse_args()
+
+    run_suite(args.scales, args.repeat, args.seed, args.output)
+    if args.compare_apply:
+        bench_clean_data(args.compare_apply, args.repeat)
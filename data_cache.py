@@ -0,0 +1,188 @@
+import os
+import json
+import hashlib
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as parquet
+except ImportError:  # the cleaned-data cache is skipped without pyarrow
+    pa = feather = parquet = None
+
+# Bump when the cache layout or cleaning logic changes
+CACHE_VERSION = 2
+CACHE_DIR = '.cord19_cache'
+
+def file_sha256(file_path, block_size=1 << 20):
+    """Content hash of a file, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def source_fingerprint(file_path, with_hash=True):
+    """Size, mtime and (optionally) content hash of the source CSV"""
+    stat = os.stat(file_path)
+    fingerprint = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+    if with_hash:
+        fingerprint['sha256'] = file_sha256(file_path)
+    return fingerprint
+
+def search_index_dir(file_path, cache_dir=CACHE_DIR):
+    """Directory of the keyword search index built for a source file"""
+    return os.path.join(cache_dir, f"{os.path.splitext(os.path.basename(file_path))[0]}-search")
+
+def _cache_paths(file_path, cache_dir, params):
+    """Cache data and metadata paths for a source file and cleaning parameters"""
+    key = json.dumps({'source': os.path.abspath(file_path), 'params': params,
+                      'version': CACHE_VERSION}, sort_keys=True)
+    name = f"{os.path.splitext(os.path.basename(file_path))[0]}-{hashlib.sha256(key.encode()).hexdigest()[:16]}"
+    base = os.path.join(cache_dir, name)
+    return base + '.feather', base + '.json'
+
+def _write_meta(meta_path, meta):
+    """Write a cache sidecar atomically"""
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump(meta, f, indent=2)
+    os.replace(meta_path + '.tmp', meta_path)
+
+def is_fresh(file_path, meta, meta_path=None):
+    """Check a stored source fingerprint against the file on disk
+
+    When only the mtime moved but the content hash still matches, the new
+    fingerprint is written back to meta_path so later reads skip the hash.
+    """
+    cached = meta.get('source', {})
+    current = source_fingerprint(file_path, with_hash=False)
+    if current['size'] != cached.get('size'):
+        return False
+    if current['mtime_ns'] == cached.get('mtime_ns'):
+        return True
+    # Same size but touched: only the content hash can tell
+    if file_sha256(file_path) != cached.get('sha256'):
+        return False
+    if meta_path is not None:
+        meta['source'] = {**cached, **current}
+        try:
+            _write_meta(meta_path, meta)
+        except OSError:  # a read-only cache still serves, it just re-hashes next time
+            pass
+    return True
+
+def read_cache(file_path, params, cache_dir=CACHE_DIR):
+    """Memory-map the cached cleaned frame, or return None if missing or stale"""
+    if feather is None:
+        return None
+    data_path, meta_path = _cache_paths(file_path, cache_dir, params)
+    if not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta.get('version') != CACHE_VERSION or meta.get('params') != params:
+            return None
+        if not is_fresh(file_path, meta, meta_path):
+            return None
+        return feather.read_table(data_path, memory_map=True).to_pandas()
+    except (OSError, ValueError):
+        return None
+
+def write_cache(df, file_path, params, cache_dir=CACHE_DIR):
+    """Write the cleaned frame as uncompressed Feather (memory-mappable)"""
+    if feather is None:
+        print("⚠️ pyarrow is not installed; skipping the cleaned-data cache")
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = _cache_paths(file_path, cache_dir, params)
+    meta = {'version': CACHE_VERSION, 'params': params, 'source': source_fingerprint(file_path)}
+
+    # Write to temporary files first so a crash never leaves a half-written cache
+    feather.write_feather(df.reset_index(drop=True), data_path + '.tmp', compression='uncompressed')
+    os.replace(data_path + '.tmp', data_path)
+    _write_meta(meta_path, meta)
+    return data_path
+
+def _chunk_schema(chunk):
+    """Arrow schema of the first cleaned chunk; all-missing columns become strings so later chunks fit"""
+    schema = pa.Schema.from_pandas(chunk, preserve_index=False)
+    return pa.schema([field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+                      for field in schema], metadata=schema.metadata)
+
+def write_cache_chunks(chunks, file_path, params, cache_dir=CACHE_DIR):
+    """Write cleaned frames (e.g. one per CSV chunk) as one Feather cache file
+
+    Only one chunk is held at a time; read_cache then memory-maps the result.
+    """
+    if feather is None:
+        print("⚠️ pyarrow is not installed; skipping the cleaned-data cache")
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = _cache_paths(file_path, cache_dir, params)
+    meta = {'version': CACHE_VERSION, 'params': params, 'source': source_fingerprint(file_path)}
+
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            if schema is None:
+                schema = _chunk_schema(chunk)
+                writer = pa.ipc.new_file(data_path + '.tmp', schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        return None
+    os.replace(data_path + '.tmp', data_path)
+    _write_meta(meta_path, meta)
+    return data_path
+
+def _parquet_paths(file_path, cache_dir, params):
+    data_path, meta_path = _cache_paths(file_path, cache_dir, params)
+    return os.path.splitext(data_path)[0] + '.parquet', os.path.splitext(meta_path)[0] + '.parquet.json'
+
+def read_parquet_path(file_path, params, cache_dir=CACHE_DIR):
+    """Path of the cleaned Parquet file for the query backends, or None if missing or stale"""
+    data_path, meta_path = _parquet_paths(file_path, cache_dir, params)
+    if parquet is None or not (os.path.exists(data_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != CACHE_VERSION or meta.get('params') != params:
+        return None
+    if not is_fresh(file_path, meta, meta_path):
+        return None
+    return data_path
+
+def write_parquet(chunks, file_path, params, cache_dir=CACHE_DIR):
+    """Write cleaned frames (e.g. one per CSV chunk) to a single Parquet file
+
+    The schema comes from the first chunk (see _chunk_schema).
+    """
+    if parquet is None:
+        print("⚠️ pyarrow is not installed; cannot write Parquet")
+        return None
+    os.makedirs(cache_dir, exist_ok=True)
+    data_path, meta_path = _parquet_paths(file_path, cache_dir, params)
+    meta = {'version': CACHE_VERSION, 'params': params, 'source': source_fingerprint(file_path)}
+
+    writer = None
+    schema = None
+    try:
+        for chunk in chunks:
+            if schema is None:
+                schema = _chunk_schema(chunk)
+                writer = parquet.ParquetWriter(data_path + '.tmp', schema)
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        return None
+    os.replace(data_path + '.tmp', data_path)
+    _write_meta(meta_path, meta)
+    return data_path
@@ -0,0 +1,163 @@
+import re
+from datetime import datetime
+import numpy as np
+import pandas as pd
+
+# Date formats seen in CORD-19 metadata: (name, full-match pattern, strptime format).
+# The first matching pattern wins, so more specific formats come first. 'ISO8601'
+# datetimes may use a space or T, omit seconds and carry a fraction and a zone.
+DATE_FORMATS = [
+    ('iso_datetime', r'\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:Z|[+-]\d{2}:?\d{2})?', 'ISO8601'),
+    ('iso', r'\d{4}-\d{1,2}-\d{1,2}', '%Y-%m-%d'),
+    ('year_month', r'\d{4}-\d{1,2}', '%Y-%m'),
+    ('ymd_slash', r'\d{4}/\d{1,2}/\d{1,2}', '%Y/%m/%d'),
+    ('mdy_slash', r'\d{1,2}/\d{1,2}/\d{4}', '%m/%d/%Y'),
+    ('day_month_abbr', r'\d{1,2} [A-Za-z]{3} \d{4}', '%d %b %Y'),
+    ('day_month_name', r'\d{1,2} [A-Za-z]{4,} \d{4}', '%d %B %Y'),
+    ('year_month_abbr_day', r'\d{4} [A-Za-z]{3} \d{1,2}', '%Y %b %d'),
+    ('year_month_name_day', r'\d{4} [A-Za-z]{4,} \d{1,2}', '%Y %B %d'),
+    ('year_month_abbr', r'\d{4} [A-Za-z]{3}', '%Y %b'),
+    ('year_month_name', r'\d{4} [A-Za-z]{4,}', '%Y %B'),
+    ('month_abbr', r'[A-Za-z]{3} \d{4}', '%b %Y'),
+    ('month_name', r'[A-Za-z]{4,} \d{4}', '%B %Y'),
+    ('year', r'\d{4}', '%Y'),
+]
+# Time zones are dropped, so datetimes keep their local date (like date-only strings)
+ZONE_SUFFIX = r'(?:Z|[+-]\d{2}:?\d{2})$'
+# Parsed dates outside this range of years are treated as missing
+YEAR_RANGE = (1900, 2024)
+DATETIME_DTYPE = 'datetime64[ns]'
+
+def date_text(value):
+    """Normalize a cell to the string that is parsed (None when it cannot be a date)"""
+    if isinstance(value, str):
+        # 'Sept' is a common abbreviation that %b does not accept
+        return re.sub(r'\bSept\b', 'Sep', value.strip(), flags=re.IGNORECASE)
+    if isinstance(value, (int, float, np.integer, np.floating)) and not pd.isna(value) and float(value).is_integer():
+        # Numeric cells are bare years (e.g. a column read as float)
+        return str(int(value))
+    if isinstance(value, (datetime, np.datetime64)):
+        return pd.Timestamp(value).strftime('%Y-%m-%d')
+    return None
+
+def date_texts(series):
+    """date_text of every cell of a column, computed once per distinct value"""
+    codes, uniques = pd.factorize(pd.Series(series).astype('object'))
+    # Code -1 (missing) picks the trailing None
+    texts = np.array([date_text(v) for v in uniques] + [None], dtype='object')
+    return pd.Series(texts[codes], index=series.index, name=series.name)
+
+def parse_date(value, formats=DATE_FORMATS):
+    """Parse a single cell; the per-cell reference for DateParser"""
+    text = date_text(value)
+    if text is None:
+        return pd.NaT
+    for _, pattern, fmt in formats:
+        if re.fullmatch(pattern, text):
+            try:
+                if fmt == 'ISO8601':
+                    parsed = pd.Timestamp(datetime.fromisoformat(re.sub(ZONE_SUFFIX, '', text)))
+                else:
+                    parsed = pd.Timestamp(datetime.strptime(text, fmt))
+            except ValueError:
+                return pd.NaT
+            return parsed if YEAR_RANGE[0] <= parsed.year <= YEAR_RANGE[1] else pd.NaT
+    return pd.NaT
+
+class DateParser:
+    """Vectorized multi-format date parser with a cache of parsed strings
+
+    Each column is reduced to its distinct values. Strings not already in
+    the cache are grouped by the first format whose pattern they fully
+    match, and each group is parsed in one pd.to_datetime call. Strings
+    matching no format (e.g. "2345-covid") become NaT; they are remembered
+    so parse can report how many cells were unmatched at no extra cost.
+    """
+
+    def __init__(self, formats=DATE_FORMATS, max_cache=200_000):
+        self.formats = formats
+        self.max_cache = max_cache
+        self._cache = {}
+        self._unmatched = set()
+
+    def clear_cache(self):
+        self._cache.clear()
+        self._unmatched.clear()
+
+    def _classify(self, texts):
+        """Index of the first matching format per string (-1 for none)"""
+        texts = pd.Series(texts, dtype='object')
+        labels = np.full(len(texts), -1, dtype='int64')
+        for i, (_, pattern, _) in enumerate(self.formats):
+            unlabeled = labels < 0
+            if not unlabeled.any():
+                break
+            matched = texts[unlabeled].str.fullmatch(pattern).fillna(False).to_numpy(dtype=bool)
+            labels[np.flatnonzero(unlabeled)[matched]] = i
+        return labels
+
+    def _parse_new(self, texts):
+        labels = self._classify(texts)
+        self._unmatched.update(text for text, label in zip(texts, labels) if label < 0)
+        parsed = np.full(len(texts), np.datetime64('NaT'), dtype=DATETIME_DTYPE)
+        texts = pd.Series(texts, dtype='object')
+        for i, (_, _, fmt) in enumerate(self.formats):
+            group = labels == i
+            if group.any():
+                group_texts = texts[group]
+                if fmt == 'ISO8601':
+                    group_texts = group_texts.str.replace(ZONE_SUFFIX, '', regex=True)
+                dates = pd.to_datetime(group_texts, format=fmt, errors='coerce')
+                # Range check before the cast, so far-off years cannot overflow nanoseconds
+                dates = dates.where(dates.dt.year.between(*YEAR_RANGE))
+                parsed[group] = dates.to_numpy().astype(DATETIME_DTYPE)
+        return parsed
+
+    def _unique_texts(self, series):
+        codes, uniques = pd.factorize(pd.Series(series).astype('object'))
+        texts = [date_text(v) for v in uniques]
+        return codes, texts
+
+    def parse(self, series, return_unmatched=False):
+        """datetime64 Series for a column of date strings (NaT where unparseable)
+
+        With return_unmatched, also returns the number of cells matching no format.
+        """
+        codes, texts = self._unique_texts(series)
+        new = sorted({t for t in texts if t is not None and t not in self._cache})
+        if len(self._cache) + len(new) > self.max_cache:
+            # Start over with just this column's strings
+            self.clear_cache()
+            new = sorted({t for t in texts if t is not None})
+        if new:
+            self._cache.update(zip(new, self._parse_new(new)))
+        nat = np.datetime64('NaT')
+        unique_dates = np.array([self._cache.get(t, nat) if t is not None else nat for t in texts],
+                                dtype=DATETIME_DTYPE)
+        dates = unique_dates[codes] if len(unique_dates) else np.full(len(codes), nat, dtype=DATETIME_DTYPE)
+        dates[codes < 0] = nat
+        dates = pd.Series(dates, index=series.index, name=series.name)
+        if not return_unmatched:
+            return dates
+        is_unmatched = np.array([t in self._unmatched for t in texts], dtype=bool)
+        return dates, int(is_unmatched[codes[codes >= 0]].sum())
+
+    def detect_formats(self, series):
+        """Number of cells per detected format ('unmatched' for cells matching no format)"""
+        codes, texts = self._unique_texts(series)
+        present = [t for t in texts if t is not None]
+        labels = np.full(len(texts), -1, dtype='int64')
+        labels[[i for i, t in enumerate(texts) if t is not None]] = self._classify(present)
+        names = np.array([name for name, _, _ in self.formats] + ['unmatched'], dtype='object')
+        counts = pd.Series(names[labels[codes[codes >= 0]]]).value_counts(dropna=False)
+        return counts
+
+# Shared parser: the cache carries over between columns and chunks
+date_parser = DateParser()
+
+def parse_dates(series, return_unmatched=False):
+    return date_parser.parse(series, return_unmatched)
+
+def date_parts(dates):
+    """Year and month (float64, NaN for NaT) of a datetime Series"""
+    return dates.dt.year.astype('float64'), dates.dt.month.astype('float64')
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+class FilterIndex:
+    """Precomputed index for the dashboard's year/organization/license filters
+
+    Rows are grouped by organization and sorted by year within each group, so
+    a year range is a searchsorted slice per selected organization. Licenses
+    are stored as integer codes and checked with a lookup table. Filtering
+    returns row positions into the original frame and never copies it.
+    """
+
+    def __init__(self, df, year_col='year', org_col='source_organization', license_col='license'):
+        self.n_rows = len(df)
+        self.years = df[year_col].to_numpy(dtype='float64', na_value=np.nan)
+        self.org_codes, org_names = pd.factorize(df[org_col])
+        self.license_codes, license_names = pd.factorize(df[license_col])
+        self.organizations = list(org_names)
+        self.licenses = list(license_names)
+        self._org_lookup = {name: code for code, name in enumerate(self.organizations)}
+        self._license_lookup = {name: code for code, name in enumerate(self.licenses)}
+        self.available_years = np.unique(self.years[~np.isnan(self.years)])
+
+        # Rows with a year and an organization, ordered by (organization, year)
+        valid = np.flatnonzero(~np.isnan(self.years) & (self.org_codes >= 0))
+        order = valid[np.lexsort((self.years[valid], self.org_codes[valid]))]
+        bounds = np.searchsorted(self.org_codes[order], np.arange(len(self.organizations) + 1))
+        self._org_positions = [order[bounds[i]:bounds[i + 1]] for i in range(len(self.organizations))]
+        self._org_years = [self.years[positions] for positions in self._org_positions]
+
+    def select(self, year_range, organizations, licenses):
+        """Sorted row positions matching a year range and the selected organizations/licenses"""
+        low, high = year_range
+        parts = []
+        for name in organizations:
+            code = self._org_lookup.get(name)
+            if code is None:
+                continue
+            years = self._org_years[code]
+            start = np.searchsorted(years, low, side='left')
+            stop = np.searchsorted(years, high, side='right')
+            parts.append(self._org_positions[code][start:stop])
+        if not parts:
+            return np.empty(0, dtype='int64')
+        positions = np.concatenate(parts)
+
+        license_ok = np.zeros(len(self.licenses) + 1, dtype=bool)
+        for name in licenses:
+            code = self._license_lookup.get(name)
+            if code is not None:
+                license_ok[code] = True
+        # Code -1 (missing license) maps to the extra last slot, which stays False
+        positions = positions[license_ok[self.license_codes[positions]]]
+        positions.sort()
+        return positions
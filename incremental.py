@@ -0,0 +1,233 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+
+import data_cache
+from token_counts import TokenCounts
+
+# Stable row keys, in order of preference
+KEY_COLUMNS = ['cord_uid', 'doi']
+SNAPSHOT_FILE = 'cleaned.feather'
+AGGREGATES_FILE = 'aggregates.json'
+# Cache version, cleaning parameters and source release of the snapshot
+META_FILE = 'meta.json'
+
+def row_hashes(df):
+    """64-bit content hash of every raw row"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy(dtype='uint64')
+
+def row_keys(df, hashes=None):
+    """Stable key per row: cord_uid or doi when present, else the row hash
+
+    Repeated keys (CORD-19 has duplicate cord_uids) get an occurrence
+    suffix so every key is unique.
+    """
+    if hashes is None:
+        hashes = row_hashes(df)
+    keys = np.array([f'h:{h:016x}' for h in hashes], dtype='object')
+    for col in reversed(KEY_COLUMNS):
+        if col in df.columns:
+            values = df[col].to_numpy(dtype='object')
+            present = df[col].notna().to_numpy()
+            keys[present] = [f'{col}:{v}' for v in values[present]]
+    occurrence = pd.Series(keys).groupby(keys).cumcount().to_numpy()
+    repeated = occurrence > 0
+    keys[repeated] = [f'{k}#{n}' for k, n in zip(keys[repeated], occurrence[repeated])]
+    return keys
+
+class Aggregates:
+    """Additive dataset aggregates that can be updated with a delta of rows"""
+
+    def __init__(self):
+        self.n_rows = 0
+        self.year_counts = {}
+        self.org_counts = {}
+        self.license_counts = {}
+        self.word_freq = {}
+        self.word_count_stats = {}
+
+    @staticmethod
+    def _add_counts(target, counts, sign):
+        for key, count in counts.items():
+            key = str(key)
+            total = target.get(key, 0) + sign * int(count)
+            if total:
+                target[key] = total
+            else:
+                target.pop(key, None)
+
+    def add(self, df_clean, sign=1):
+        """Add (sign=1) or remove (sign=-1) the contribution of cleaned rows"""
+        self.n_rows += sign * len(df_clean)
+        for col in [c for c in df_clean.columns if 'year' in c]:
+            counts = df_clean[col].dropna().astype(int).value_counts()
+            self._add_counts(self.year_counts.setdefault(col, {}), counts, sign)
+        if 'source_organization' in df_clean.columns:
+            self._add_counts(self.org_counts, df_clean['source_organization'].value_counts(), sign)
+        if 'license' in df_clean.columns:
+            self._add_counts(self.license_counts, df_clean['license'].value_counts(), sign)
+        if 'paper_title' in df_clean.columns:
+            self._add_counts(self.word_freq, dict(TokenCounts.from_texts(df_clean['paper_title']).most_common()), sign)
+        for col in [c for c in df_clean.columns if c.endswith('_word_count')]:
+            values = df_clean[col].dropna().to_numpy(dtype='float64')
+            stats = self.word_count_stats.setdefault(col, {'count': 0, 'sum': 0.0, 'sum_sq': 0.0})
+            stats['count'] += sign * len(values)
+            stats['sum'] += sign * float(values.sum())
+            stats['sum_sq'] += sign * float((values ** 2).sum())
+        return self
+
+    def word_count_summary(self, col):
+        """Mean and standard deviation of a word-count column"""
+        stats = self.word_count_stats.get(col, {'count': 0})
+        n = stats['count']
+        if n == 0:
+            return {'count': 0, 'mean': np.nan, 'std': np.nan}
+        mean = stats['sum'] / n
+        variance = (stats['sum_sq'] - n * mean ** 2) / (n - 1) if n > 1 else np.nan
+        return {'count': n, 'mean': mean, 'std': float(np.sqrt(max(variance, 0))) if n > 1 else np.nan}
+
+    def top(self, counts, n):
+        return sorted(counts.items(), key=lambda item: -item[1])[:n]
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregates = cls()
+        vars(aggregates).update(data)
+        return aggregates
+
+def default_snapshot_dir(cache_dir=data_cache.CACHE_DIR):
+    """Directory of the incremental snapshot (shared by every release of the data)"""
+    return os.path.join(cache_dir, 'snapshot')
+
+def has_snapshot(directory):
+    return os.path.exists(os.path.join(directory, AGGREGATES_FILE))
+
+def _read_meta(snapshot_dir):
+    try:
+        with open(os.path.join(snapshot_dir, META_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _matches(meta, params):
+    """Whether a snapshot was built by this cache version with these cleaning parameters"""
+    return bool(meta) and meta.get('version') == data_cache.CACHE_VERSION and meta.get('params') == params
+
+def _load_snapshot(snapshot_dir, params):
+    path = os.path.join(snapshot_dir, SNAPSHOT_FILE)
+    aggregates_path = os.path.join(snapshot_dir, AGGREGATES_FILE)
+    if data_cache.feather is None or not (os.path.exists(path) and os.path.exists(aggregates_path)):
+        return None, None
+    if not _matches(_read_meta(snapshot_dir), params):
+        print("⚠️ The snapshot was built by another version or with other cleaning parameters; rebuilding it")
+        return None, None
+    with open(aggregates_path) as f:
+        aggregates = Aggregates.from_dict(json.load(f))
+    return data_cache.feather.read_table(path).to_pandas(), aggregates
+
+def _save_snapshot(snapshot_dir, df_snapshot, aggregates, meta):
+    os.makedirs(snapshot_dir, exist_ok=True)
+    path = os.path.join(snapshot_dir, SNAPSHOT_FILE)
+    data_cache.feather.write_feather(df_snapshot.reset_index(drop=True), path + '.tmp')
+    with open(os.path.join(snapshot_dir, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    with open(os.path.join(snapshot_dir, AGGREGATES_FILE + '.tmp'), 'w') as f:
+        json.dump(aggregates.to_dict(), f, indent=2)
+    os.replace(path + '.tmp', path)
+    os.replace(os.path.join(snapshot_dir, AGGREGATES_FILE + '.tmp'), os.path.join(snapshot_dir, AGGREGATES_FILE))
+
+def update_snapshot(df_raw, snapshot_dir, clean, params, source_path=None, rebuild=False):
+    """Clean only the new/changed rows of a release and merge them into the snapshot
+
+    clean(df, cols_to_drop) cleans a frame (Analysis.clean_data) according to
+    params (Analysis.cleaning_parameters). Returns the merged cleaned frame,
+    the updated Aggregates and a dict of change counts. The columns dropped
+    for missing values are the ones chosen by the first (full) run, so a
+    small delta is never judged on its own. A snapshot from another cache
+    version or other params, or any snapshot with rebuild=True, is replaced
+    by a full run. source_path is the release's CSV, recorded so
+    read_snapshot can tell which file the snapshot reflects.
+    """
+    hashes = row_hashes(df_raw)
+    keys = row_keys(df_raw, hashes)
+    df_snapshot, aggregates = (None, None) if rebuild else _load_snapshot(snapshot_dir, params)
+
+    if df_snapshot is None:
+        delta = np.ones(len(df_raw), dtype=bool)
+        kept = pd.DataFrame()
+        aggregates = Aggregates()
+        changes = {'new': len(df_raw), 'changed': 0, 'removed': 0, 'unchanged': 0}
+    else:
+        old_hash = pd.Series(df_snapshot['_row_hash'].to_numpy(), index=df_snapshot['_key'].to_numpy())
+        previous = old_hash.reindex(keys).to_numpy()
+        is_new = pd.isna(previous)
+        is_changed = ~is_new & (previous != hashes)
+        delta = is_new | is_changed
+        # Old rows that were changed or dropped from the release leave the aggregates
+        outdated = ~df_snapshot['_key'].isin(keys[~delta])
+        aggregates.add(df_snapshot.loc[outdated].drop(columns=['_key', '_row_hash']), sign=-1)
+        kept = df_snapshot.loc[~outdated]
+        changes = {
+            'new': int(is_new.sum()),
+            'changed': int(is_changed.sum()),
+            'removed': int(outdated.sum() - is_changed.sum()),
+            'unchanged': int(len(kept)),
+        }
+
+    cols_to_drop = None
+    if df_snapshot is not None:
+        # Keep the snapshot's column set so the merged frame stays consistent
+        cols_to_drop = [c for c in df_raw.columns if c not in df_snapshot.columns]
+    df_delta = clean(df_raw.loc[delta], cols_to_drop)
+    if df_snapshot is not None:
+        df_delta = df_delta.reindex(columns=[c for c in df_snapshot.columns if c not in ('_key', '_row_hash')])
+    df_delta['_key'] = keys[delta]
+    df_delta['_row_hash'] = hashes[delta]
+    aggregates.add(df_delta.drop(columns=['_key', '_row_hash']), sign=1)
+
+    # Merge and restore the row order of the new release
+    merged = pd.concat([kept, df_delta], ignore_index=True)
+    order = pd.Series(np.arange(len(keys)), index=keys)
+    merged = merged.iloc[np.argsort(order.reindex(merged['_key'].to_numpy()).to_numpy(), kind='stable')]
+    merged = merged.reset_index(drop=True)
+
+    meta = {'version': data_cache.CACHE_VERSION, 'params': params, 'source': None}
+    if source_path is not None:
+        meta['source'] = {'path': os.path.abspath(source_path), **data_cache.source_fingerprint(source_path)}
+    _save_snapshot(snapshot_dir, merged, aggregates, meta)
+    return merged.drop(columns=['_key', '_row_hash']), aggregates, changes
+
+def read_snapshot(snapshot_dir, file_path, accepted_params):
+    """Merged cleaned frame of the snapshot if it was built from file_path as it is now, else None
+
+    The snapshot must also come from this cache version and one of the
+    accepted_params. Read-only: readers such as the dashboard never update
+    the snapshot.
+    """
+    meta = _read_meta(snapshot_dir)
+    if data_cache.feather is None or not has_snapshot(snapshot_dir) or not meta:
+        return None
+    if not any(_matches(meta, params) for params in accepted_params):
+        return None
+    source = meta.get('source')
+    if not source or source.get('path') != os.path.abspath(file_path):
+        return None
+    if not os.path.exists(file_path) or not data_cache.is_fresh(file_path, meta, os.path.join(snapshot_dir, META_FILE)):
+        return None
+    df_snapshot = data_cache.feather.read_table(os.path.join(snapshot_dir, SNAPSHOT_FILE), memory_map=True).to_pandas()
+    return df_snapshot.drop(columns=['_key', '_row_hash'])
+
+def print_changes(changes, aggregates):
+    """Print the delta of a release and the merged totals"""
+    print(f"\n🔁 Incremental update: {changes['new']:,} new, {changes['changed']:,} changed, "
+          f"{changes['removed']:,} removed, {changes['unchanged']:,} unchanged rows")
+    print(f"  • Total papers: {aggregates.n_rows:,}")
+    print(f"  • Unique source organizations: {len(aggregates.org_counts)}")
+    print(f"  • Top licenses: {aggregates.top(aggregates.license_counts, 3)}")
+    print(f"  • Top title words: {aggregates.top(aggregates.word_freq, 5)}")
+    if 'paper_title_word_count' in aggregates.word_count_stats:
+        print(f"  • Average title length: {aggregates.word_count_summary('paper_title_word_count')['mean']:.1f} words")
@@ -0,0 +1,127 @@
+import json
+import time
+import functools
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None if unknown)"""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+class Profiler:
+    """Records wall time, CPU time and memory peaks for nested pipeline stages
+
+    Disabled by default so stages cost almost nothing. When enabled, each
+    stage records its wall and CPU time, the process peak RSS at stage end,
+    and (with trace_memory) the tracemalloc peak reached inside the stage.
+    Nested stages are named parent/child.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.trace_memory = False
+        self.records = []
+        self._stack = []
+        self._t0 = time.perf_counter()
+
+    def enable(self, trace_memory=True):
+        self.enabled = True
+        self.trace_memory = trace_memory
+        self._t0 = time.perf_counter()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def disable(self):
+        self.enabled = False
+        if self.trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name):
+        if not self.enabled:
+            yield
+            return
+
+        full_name = '/'.join([frame['name'] for frame in self._stack] + [name])
+        if self.trace_memory:
+            # Fold the peak so far into the parent before resetting it for this stage
+            if self._stack:
+                parent = self._stack[-1]
+                parent['peak'] = max(parent['peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        frame = {'name': name, 'peak': 0}
+        self._stack.append(frame)
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            self._stack.pop()
+            traced_peak = None
+            if self.trace_memory:
+                traced_peak = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                if self._stack:
+                    self._stack[-1]['peak'] = max(self._stack[-1]['peak'], traced_peak)
+            self._record(full_name, len(self._stack), wall_start, wall, cpu, traced_peak)
+
+    def add_record(self, name, wall_s, cpu_s, **extra):
+        """Record a sub-stage of the current stage that was timed elsewhere (e.g. in a worker process)"""
+        if not self.enabled:
+            return None
+        full_name = '/'.join([frame['name'] for frame in self._stack] + [name])
+        start = time.perf_counter() - wall_s
+        return self._record(full_name, len(self._stack), start, wall_s, cpu_s, None, **extra)
+
+    def _record(self, name, depth, start, wall_s, cpu_s, tracemalloc_peak, **extra):
+        record = {
+            'name': name,
+            'depth': depth,
+            'start_s': round(start - self._t0, 6),
+            'wall_s': round(wall_s, 6),
+            'cpu_s': round(cpu_s, 6),
+            'peak_rss_mb': peak_rss_mb(),
+            'tracemalloc_peak_mb': None if tracemalloc_peak is None else tracemalloc_peak / 1024**2,
+        }
+        record.update(extra)
+        self.records.append(record)
+        return record
+
+    def instrumented(self, name=None):
+        """Decorator running the function inside a stage named after it"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.stage(name or func.__name__):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def write_report(self, path):
+        """Write the recorded stages as JSON"""
+        with open(path, 'w') as f:
+            json.dump({'stages': self.records}, f, indent=2)
+
+    def print_report(self):
+        print("\n⏱️ Stage timings:")
+        # Records are appended when a stage ends; show them in start order
+        for record in sorted(self.records, key=lambda r: (r['start_s'], r['depth'])):
+            indent = '  ' * (record['depth'] + 1)
+            line = f"{indent}{record['name'].split('/')[-1]}: {record['wall_s']:.3f}s wall, {record['cpu_s']:.3f}s CPU"
+            if record['tracemalloc_peak_mb'] is not None:
+                line += f", {record['tracemalloc_peak_mb']:.1f} MB traced peak"
+            print(line)
+
+# Shared profiler used by the pipeline modules
+profiler = Profiler()
+stage = profiler.stage
+instrumented = profiler.instrumented
@@ -0,0 +1,177 @@
+import io
+import sys
+import time
+import hashlib
+import threading
+from collections import OrderedDict, deque
+import numpy as np
+import pandas as pd
+
+def artifact_size(value):
+    """Approximate memory footprint in bytes of a cached artifact"""
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(artifact_size(k) + artifact_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(artifact_size(v) for v in value)
+    return sys.getsizeof(value)
+
+class LRUCache:
+    """Thread-safe LRU cache, bounded by entry count and total size
+
+    Values are bytes by default; with sizeof=artifact_size any artifact
+    (row positions, metric dicts, PNGs) shares the same byte budget. Keys
+    that are (kind, key) tuples also get hits, misses and compute latencies
+    tracked per kind.
+    """
+
+    def __init__(self, max_entries=64, max_bytes=32 * 1024**2, sizeof=len, latency_window=1000):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.latency_window = latency_window
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._kinds = {}
+
+    @staticmethod
+    def _kind(key):
+        return key[0] if isinstance(key, tuple) else 'default'
+
+    def _kind_stats(self, kind):
+        return self._kinds.setdefault(kind, {'hits': 0, 'misses': 0,
+                                             'latencies': deque(maxlen=self.latency_window)})
+
+    def get(self, key):
+        with self._lock:
+            stats = self._kind_stats(self._kind(key))
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            stats['hits'] += 1
+            return value
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                del self._entries[key]
+                self._bytes -= self._sizes.pop(key)
+            if size > self.max_bytes:
+                return value
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                evicted, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(evicted)
+                self.evictions += 1
+            return value
+
+    def record_latency(self, kind, seconds):
+        """Record how long producing an artifact (or a page) of this kind took"""
+        with self._lock:
+            self._kind_stats(kind)['latencies'].append(seconds)
+
+    def get_or_compute(self, key, compute):
+        """Cached value for key, computing (and timing) it on a miss"""
+        value = self.get(key)
+        if value is None:
+            start = time.perf_counter()
+            value = compute()
+            self.record_latency(self._kind(key), time.perf_counter() - start)
+            self.put(key, value)
+        return value
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """Sizes, hit rates and compute latencies (ms), overall and per kind"""
+        hit_rate = lambda hits, misses: hits / (hits + misses) if hits + misses else None
+        with self._lock:
+            kinds = {}
+            for kind, stats in self._kinds.items():
+                latencies = np.array(stats['latencies'], dtype='float64') * 1000
+                kinds[kind] = {
+                    'entries': sum(1 for key in self._entries if self._kind(key) == kind),
+                    'bytes': sum(size for key, size in self._sizes.items() if self._kind(key) == kind),
+                    'hits': stats['hits'],
+                    'misses': stats['misses'],
+                    'hit_rate': hit_rate(stats['hits'], stats['misses']),
+                    'latency_ms': {
+                        'count': len(latencies),
+                        'mean': float(latencies.mean()) if len(latencies) else None,
+                        'p95': float(np.percentile(latencies, 95)) if len(latencies) else None,
+                        'max': float(latencies.max()) if len(latencies) else None,
+                    },
+                }
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': hit_rate(self.hits, self.misses),
+                'evictions': self.evictions,
+                'kinds': kinds,
+            }
+
+def frequency_key(frequencies, **params):
+    """Stable hash of a word-frequency mapping and the render parameters"""
+    digest = hashlib.sha1()
+    for word, count in sorted(frequencies.items()):
+        digest.update(f"{word}\0{count}\0".encode())
+    digest.update(repr(sorted(params.items())).encode())
+    return digest.hexdigest()
+
+def render_wordcloud_png(frequencies, cache=None, width=400, height=200, max_words=50,
+                         colormap='viridis', scale=2.5):
+    """Render a word cloud to PNG bytes, reusing a cached image for the same frequencies"""
+    params = dict(width=width, height=height, max_words=max_words, colormap=colormap, scale=scale)
+    key = ('wordcloud', frequency_key(frequencies, **params))
+    if cache is not None:
+        png = cache.get(key)
+        if png is not None:
+            return png
+
+    # Imported here so the dashboard starts without loading wordcloud (and matplotlib)
+    from wordcloud import WordCloud
+
+    start = time.perf_counter()
+    # Render straight to an image: no matplotlib figure is created, so none can leak
+    wordcloud = WordCloud(
+        width=width,
+        height=height,
+        background_color='white',
+        colormap=colormap,
+        max_words=max_words,
+        scale=scale,
+        random_state=42  # same frequencies always give the same layout
+    ).generate_from_frequencies(frequencies)
+    buffer = io.BytesIO()
+    wordcloud.to_image().save(buffer, format='PNG')
+    png = buffer.getvalue()
+
+    if cache is not None:
+        cache.record_latency('wordcloud', time.perf_counter() - start)
+        cache.put(key, png)
+    return png
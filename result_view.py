@@ -0,0 +1,47 @@
+import math
+import tempfile
+import numpy as np
+
+class ResultView:
+    """Lazy view over selected rows of a frame
+
+    Holds only the row positions. Pages, single records and CSV chunks are
+    materialized on demand, so a large selection never copies the dataset.
+    """
+
+    def __init__(self, df, positions, columns=None):
+        self.df = df
+        self.positions = np.asarray(positions, dtype='int64')
+        self.columns = [col for col in (columns or df.columns) if col in df.columns]
+
+    def __len__(self):
+        return len(self.positions)
+
+    def n_pages(self, page_size=10):
+        return max(1, math.ceil(len(self) / page_size))
+
+    def page(self, page, page_size=10):
+        """Displayed columns for one page; the index is the row number within the view"""
+        start = page * page_size
+        rows = self.positions[start:start + page_size]
+        page_df = self.df[self.columns].iloc[rows]
+        page_df.index = range(start, start + len(rows))
+        return page_df
+
+    def record(self, i):
+        """All columns of the i-th row in the view"""
+        return self.df.iloc[self.positions[i]]
+
+    def iter_csv(self, chunk_rows=50_000):
+        """CSV text of every column, chunk by chunk (header first)"""
+        for start in range(0, max(len(self), 1), chunk_rows):
+            chunk = self.df.iloc[self.positions[start:start + chunk_rows]]
+            yield chunk.to_csv(index=False, header=(start == 0))
+
+    def to_csv_file(self, chunk_rows=50_000):
+        """Write the CSV to an anonymous temporary file, rewound for reading"""
+        f = tempfile.TemporaryFile()
+        for text in self.iter_csv(chunk_rows):
+            f.write(text.encode('utf-8'))
+        f.seek(0)
+        return f
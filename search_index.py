@@ -0,0 +1,176 @@
+import os
+import re
+import json
+from array import array
+import numpy as np
+
+# Columns indexed for keyword search
+SEARCH_COLUMNS = ['paper_title', 'abstract']
+TOKEN_PATTERN = re.compile(r'\w+')
+# Rows tokenized at a time while building the index
+BUILD_CHUNK_ROWS = 10_000
+
+def tokenize(text):
+    """Lower-cased word tokens used both when indexing and when searching"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+def _chunk_pairs(df, columns, start, stop, term_ids):
+    """Distinct (term id, row position) pairs for rows [start, stop), as int32 arrays
+
+    Pairs are collected in compact int32 buffers rather than lists of
+    Python ints; new terms are added to term_ids.
+    """
+    pair_terms = array('i')
+    pair_docs = array('i')
+    for col in columns:
+        values = df[col].iloc[start:stop].to_numpy(dtype='object')
+        for doc, text in enumerate(values, start=start):
+            if not isinstance(text, str):
+                continue
+            terms = [term_ids.setdefault(term, len(term_ids)) for term in set(tokenize(text))]
+            pair_terms.extend(terms)
+            pair_docs.extend([doc] * len(terms))
+    pair_terms = np.frombuffer(pair_terms, dtype='int32').astype('int64')
+    pair_docs = np.frombuffer(pair_docs, dtype='int32') - start
+    # One pair per term and row, even if the term appears in several columns
+    keys = np.unique(pair_terms * (stop - start) + pair_docs)
+    return (keys // (stop - start)).astype('int32'), (keys % (stop - start) + start).astype('int32')
+
+def build_index(df, index_dir, columns=SEARCH_COLUMNS, fingerprint=None, chunk_rows=BUILD_CHUNK_ROWS):
+    """Write an inverted index (term dictionary + posting lists) as .npy files
+
+    Terms are stored sorted, as one UTF-8 byte blob with offsets. Posting
+    lists are sorted int32 row positions concatenated into one array. All
+    arrays are opened memory-mapped by SearchIndex.
+
+    Rows are tokenized chunk_rows at a time into int32 (term, row) pair
+    arrays, so the build holds 8 bytes per pair; the postings are then
+    scattered chunk by chunk straight into the memory-mapped postings file.
+    """
+    columns = [col for col in columns if col in df.columns]
+    term_ids = {}
+    chunks = [_chunk_pairs(df, columns, start, min(start + chunk_rows, len(df)), term_ids)
+              for start in range(0, len(df), chunk_rows)]
+
+    # Remap term ids to sorted term order
+    terms = sorted(term_ids, key=lambda t: t.encode('utf-8'))
+    remap = np.empty(len(terms), dtype='int32')
+    remap[[term_ids[t] for t in terms]] = np.arange(len(terms))
+    del term_ids
+    counts = np.zeros(len(terms), dtype='int64')
+    for pair_terms, _ in chunks:
+        counts += np.bincount(remap[pair_terms], minlength=len(terms))
+    posting_offsets = np.zeros(len(terms) + 1, dtype='int64')
+    np.cumsum(counts, out=posting_offsets[1:])
+
+    encoded = [t.encode('utf-8') for t in terms]
+    term_offsets = np.zeros(len(terms) + 1, dtype='int64')
+    np.cumsum([len(t) for t in encoded], out=term_offsets[1:])
+    term_bytes = np.frombuffer(b''.join(encoded), dtype='uint8')
+
+    os.makedirs(index_dir, exist_ok=True)
+    if os.path.exists(os.path.join(index_dir, 'meta.json')):
+        os.remove(os.path.join(index_dir, 'meta.json'))
+    np.save(os.path.join(index_dir, 'term_bytes.npy'), term_bytes)
+    np.save(os.path.join(index_dir, 'term_offsets.npy'), term_offsets)
+    np.save(os.path.join(index_dir, 'posting_offsets.npy'), posting_offsets)
+    _write_postings(os.path.join(index_dir, 'postings.npy'), chunks, remap, posting_offsets)
+    # Metadata goes last: an index without it is treated as missing
+    with open(os.path.join(index_dir, 'meta.json'), 'w') as f:
+        json.dump({'n_docs': len(df), 'n_terms': len(terms), 'columns': columns,
+                   'fingerprint': fingerprint}, f, indent=2)
+    return SearchIndex(index_dir)
+
+def _write_postings(path, chunks, remap, posting_offsets):
+    """Scatter each chunk's row positions into its terms' slots of the postings file
+
+    Chunks are in row order, so every posting list comes out sorted.
+    """
+    total = int(posting_offsets[-1])
+    if total == 0:
+        np.save(path, np.empty(0, dtype='int32'))
+        return
+    postings = np.lib.format.open_memmap(path, mode='w+', dtype='int32', shape=(total,))
+    cursor = posting_offsets[:-1].copy()
+    for pair_terms, pair_docs in chunks:
+        pair_terms = remap[pair_terms]
+        order = np.lexsort((pair_docs, pair_terms))
+        pair_terms, pair_docs = pair_terms[order], pair_docs[order]
+        # Rank of each pair among the chunk's pairs for the same term
+        rank = np.arange(len(pair_terms)) - np.searchsorted(pair_terms, pair_terms)
+        postings[cursor[pair_terms] + rank] = pair_docs
+        cursor += np.bincount(pair_terms, minlength=len(cursor))
+    postings.flush()
+    del postings
+
+class SearchIndex:
+    """Memory-mapped inverted index; opening it reads only the metadata"""
+
+    def __init__(self, index_dir):
+        with open(os.path.join(index_dir, 'meta.json')) as f:
+            self.meta = json.load(f)
+        self.n_docs = self.meta['n_docs']
+        load = lambda name: np.load(os.path.join(index_dir, f'{name}.npy'), mmap_mode='r')
+        self.term_bytes = load('term_bytes')
+        self.term_offsets = load('term_offsets')
+        self.posting_offsets = load('posting_offsets')
+        self.postings = load('postings')
+
+    @classmethod
+    def open(cls, index_dir, fingerprint=None):
+        """Open an existing index, or return None if it is missing or stale"""
+        try:
+            index = cls(index_dir)
+        except (OSError, ValueError, KeyError):
+            return None
+        if fingerprint is not None and index.meta.get('fingerprint') != fingerprint:
+            return None
+        return index
+
+    def _term(self, i):
+        return self.term_bytes[self.term_offsets[i]:self.term_offsets[i + 1]].tobytes()
+
+    def lookup(self, term):
+        """Posting list (sorted row positions) for one term"""
+        target = term.encode('utf-8')
+        low, high = 0, len(self.term_offsets) - 1
+        # Binary search over the sorted term dictionary
+        while low < high:
+            mid = (low + high) // 2
+            if self._term(mid) < target:
+                low = mid + 1
+            else:
+                high = mid
+        if low < len(self.term_offsets) - 1 and self._term(low) == target:
+            return self.postings[self.posting_offsets[low]:self.posting_offsets[low + 1]]
+        return np.empty(0, dtype='int32')
+
+    def search(self, query):
+        """Row positions containing every word of the query (None for an empty query)"""
+        terms = set(tokenize(query))
+        if not terms:
+            return None
+        postings = sorted((self.lookup(term) for term in terms), key=len)
+        # Intersect starting from the rarest term
+        result = np.asarray(postings[0], dtype='int64')
+        for posting in postings[1:]:
+            if len(result) == 0:
+                break
+            result = np.intersect1d(result, posting, assume_unique=True)
+        return result
+
+if __name__ == "__main__":
+    import argparse
+    import data_cache
+    from Analysis import load_cleaned_data
+
+    parser = argparse.ArgumentParser(description="Build the keyword search index for the dashboard")
+    parser.add_argument('file_path', nargs='?', default='CORD19 datasets - Sheet 1.csv')
+    parser.add_argument('--index-dir', default=None,
+                        help="Output directory (default: next to the cleaned-data cache)")
+    args = parser.parse_args()
+
+    index_dir = args.index_dir or data_cache.search_index_dir(args.file_path)
+    df_clean = load_cleaned_data(args.file_path, compact=True)
+    index = build_index(df_clean, index_dir, fingerprint=data_cache.source_fingerprint(args.file_path, with_hash=False))
+    print(f"🔎 Indexed {index.n_docs:,} papers, {index.meta['n_terms']:,} terms -> {index_dir}")
@@ -0,0 +1,231 @@
+import numpy as np
+import pandas as pd
+
+from token_counts import TokenCounts
+
+class QuantileSketch:
+    """KLL-style mergeable quantile sketch with fixed memory
+
+    Values sit in levels; an item at level h stands for 2**h original values.
+    When a level holds more than k items it is sorted and every other item
+    (from a random offset) is promoted to the next level. Each such
+    compaction at level h moves any rank by at most 2**h, and that worst case
+    is accumulated in max_rank_error, so the reported bound is guaranteed.
+    Count, sum, min and max are exact.
+    """
+
+    def __init__(self, k=2048, seed=0):
+        self.k = k
+        self.levels = [np.empty(0, dtype='float64')]
+        self.n = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.max_rank_error = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values):
+        values = np.asarray(values, dtype='float64')
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.sum += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0, dtype='float64'))
+        for h, items in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.max_rank_error += other.max_rank_error
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            items = self.levels[h]
+            if len(items) > self.k:
+                items = np.sort(items)
+                # An odd item out stays at this level with its weight
+                keep = items[:1] if len(items) % 2 else items[:0]
+                pairs = items[len(keep):]
+                promoted = pairs[self._rng.integers(2)::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0, dtype='float64'))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.max_rank_error += 2 ** h
+            h += 1
+
+    def quantile(self, q):
+        """Value at quantile q (0..1); its rank is within rank_error of q"""
+        if self.n == 0:
+            return np.nan
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(items), 2 ** h, dtype='int64') for h, items in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        return float(values[order][min(np.searchsorted(cumulative, q * cumulative[-1]), len(values) - 1)])
+
+    @property
+    def mean(self):
+        return self.sum / self.n if self.n else np.nan
+
+    @property
+    def rank_error(self):
+        """Guaranteed bound on the normalized rank error of any quantile"""
+        return self.max_rank_error / self.n if self.n else 0.0
+
+    @property
+    def size(self):
+        return sum(len(items) for items in self.levels)
+
+class HyperLogLog:
+    """Mergeable distinct-count sketch with 2**p one-byte registers"""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype='uint8')
+
+    def update(self, values):
+        values = pd.Series(values).dropna().to_numpy(dtype='object')
+        if len(values) == 0:
+            return self
+        hashes = pd.util.hash_array(values)
+        index = (hashes >> np.uint64(64 - self.p)).astype('int64')
+        # The remaining 64 - p bits (< 2**53) are exact as floats, so frexp gives their bit length
+        rest = (hashes & np.uint64((1 << (64 - self.p)) - 1)).astype('float64')
+        rank = (64 - self.p) - np.frexp(rest)[1] + 1
+        np.maximum.at(self.registers, index, rank.astype('uint8'))
+        return self
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype('int64')))
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities
+            estimate = m * np.log(m / zeros)
+        return float(estimate)
+
+    @property
+    def relative_error(self):
+        """Standard error of the estimate relative to the true count"""
+        return 1.04 / np.sqrt(len(self.registers))
+
+class TopKSketch:
+    """Misra-Gries (space-saving) heavy-hitter summary with at most capacity counters
+
+    Reported counts never exceed the true count and undercount it by at most
+    max_error, the total amount subtracted while pruning. Summaries merge by
+    adding counters and pruning again.
+    """
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.counters = {}
+        self.n = 0
+        self.max_error = 0
+
+    def _add(self, counts):
+        for item, count in counts.items():
+            if count > 0:
+                self.counters[item] = self.counters.get(item, 0) + int(count)
+
+    def update_counts(self, counts):
+        """Add exact counts for a batch of items (e.g. one chunk)"""
+        self._add(counts)
+        self.n += int(sum(counts.values()))
+        self._prune()
+        return self
+
+    def merge(self, other):
+        self._add(other.counters)
+        self.n += other.n
+        self.max_error += other.max_error
+        self._prune()
+        return self
+
+    def _prune(self):
+        if len(self.counters) <= self.capacity:
+            return
+        threshold = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {item: count - threshold for item, count in self.counters.items() if count > threshold}
+        self.max_error += threshold
+
+    def most_common(self, n=None):
+        return sorted(self.counters.items(), key=lambda item: -item[1])[:n]
+
+class ApproxSummary:
+    """Fixed-memory, mergeable summary of cleaned CORD-19 rows
+
+    Built per chunk or partition with from_frame and combined with merge.
+    Year and license counts are exact (small domains); word-count
+    quantiles, unique organizations and top title words are sketched.
+    """
+
+    def __init__(self, quantile_k=2048, hll_p=12, top_capacity=1000):
+        self.n_rows = 0
+        self.known_authors = 0
+        self.year_counts = {}
+        self.license_counts = {}
+        self.word_counts = {}
+        self.quantile_k = quantile_k
+        self.organizations = HyperLogLog(hll_p)
+        self.top_organizations = TopKSketch(top_capacity)
+        self.title_words = TopKSketch(top_capacity)
+
+    @classmethod
+    def from_frame(cls, df, **params):
+        summary = cls(**params)
+        summary.n_rows = len(df)
+        for col in [c for c in df.columns if 'year' in c]:
+            summary.year_counts[col] = df[col].dropna().astype(int).value_counts().to_dict()
+        if 'license' in df.columns:
+            summary.license_counts = df['license'].value_counts().to_dict()
+        if 'author_list' in df.columns:
+            summary.known_authors = int((df['author_list'] != 'Unknown').sum())
+        for col in [c for c in df.columns if c.endswith('_word_count')]:
+            summary.word_counts[col] = QuantileSketch(summary.quantile_k).update(df[col])
+        if 'source_organization' in df.columns:
+            summary.organizations.update(df['source_organization'])
+            summary.top_organizations.update_counts(df['source_organization'].value_counts().to_dict())
+        if 'paper_title' in df.columns:
+            summary.title_words.update_counts(dict(TokenCounts.from_texts(df['paper_title']).most_common()))
+        return summary
+
+    @staticmethod
+    def _merge_counts(target, counts):
+        for key, count in counts.items():
+            target[key] = target.get(key, 0) + count
+
+    def merge(self, other):
+        self.n_rows += other.n_rows
+        self.known_authors += other.known_authors
+        for col, counts in other.year_counts.items():
+            self._merge_counts(self.year_counts.setdefault(col, {}), counts)
+        self._merge_counts(self.license_counts, other.license_counts)
+        for col, sketch in other.word_counts.items():
+            if col in self.word_counts:
+                self.word_counts[col].merge(sketch)
+            else:
+                self.word_counts[col] = sketch
+        self.organizations.merge(other.organizations)
+        self.top_organizations.merge(other.top_organizations)
+        self.title_words.merge(other.title_words)
+        return self
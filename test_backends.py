@@ -0,0 +1,39 @@
+import contextlib
+import io
+
+import pytest
+
+from Analysis import analyze_data, clean_data
+from backends import DuckDBBackend, PandasBackend, check_parity, default_selections
+from benchmark import generate_cord19_frame
+from token_counts import TokenCounts
+
+pytest.importorskip('duckdb')
+pytest.importorskip('pyarrow')
+
+@pytest.fixture(scope='module', params=[False, True], ids=['default', 'compact'])
+def df_clean(request):
+    return clean_data(generate_cord19_frame(5_000, seed=7), compact=request.param)
+
+def test_duckdb_matches_pandas(df_clean, tmp_path):
+    parquet_path = str(tmp_path / 'papers.parquet')
+    df_clean.to_parquet(parquet_path, index=False)
+    selections = default_selections(df_clean)
+    assert selections
+    assert check_parity(DuckDBBackend(parquet_path), PandasBackend(df_clean), selections) == []
+
+def test_parity_detects_differences(df_clean, tmp_path):
+    parquet_path = str(tmp_path / 'papers.parquet')
+    df_clean.iloc[1:].to_parquet(parquet_path, index=False)
+    assert 'n_rows' in check_parity(DuckDBBackend(parquet_path), PandasBackend(df_clean))
+
+def test_report_matches_across_backends(df_clean, tmp_path):
+    parquet_path = str(tmp_path / 'papers.parquet')
+    df_clean.to_parquet(parquet_path, index=False)
+    reports = []
+    for data, token_counts in [(df_clean, TokenCounts.from_texts(df_clean['paper_title'])),
+                               (DuckDBBackend(parquet_path), None)]:
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            analyze_data(data, token_counts)
+        reports.append(output.getvalue())
+    assert reports[0] == reports[1]
@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+
+# Common stop words filtered out of paper titles
+STOP_WORDS = frozenset({'the', 'and', 'of', 'in', 'to', 'a', 'for', 'with', 'on', 'as', 'by', 'an', 'at'})
+
+class TokenCounts:
+    """Sparse per-document token counts for a text column
+
+    Each text is tokenized once (whitespace split, lower-cased, words
+    of at least min_length characters, stop words removed). Counts are kept as
+    (document, token, count) triples so any subset of rows can be aggregated
+    without re-tokenizing.
+    """
+
+    def __init__(self, doc_ids, token_ids, counts, vocabulary, n_docs):
+        self.doc_ids = doc_ids
+        self.token_ids = token_ids
+        self.counts = counts
+        self.vocabulary = vocabulary
+        self.n_docs = n_docs
+
+    @classmethod
+    def from_texts(cls, texts, stop_words=STOP_WORDS, min_length=4):
+        """Tokenize every text in a Series exactly once"""
+        texts = pd.Series(texts)
+        values = texts.to_numpy(dtype='object')
+        missing = texts.isna().to_numpy()
+
+        index = {}
+        doc_ids = []
+        token_ids = []
+        for doc, (text, is_missing) in enumerate(zip(values, missing)):
+            if is_missing:
+                continue
+            for word in str(text).split():
+                if len(word) < min_length:
+                    continue
+                word = word.lower()
+                if word in stop_words:
+                    continue
+                token_ids.append(index.setdefault(word, len(index)))
+                doc_ids.append(doc)
+
+        # Collapse repeated (document, token) pairs into counts, keeping the
+        # entries in first-occurrence order so ties can be broken like Counter
+        n_tokens = max(len(index), 1)
+        keys = np.asarray(doc_ids, dtype='int64') * n_tokens + np.asarray(token_ids, dtype='int64')
+        keys, first, counts = np.unique(keys, return_index=True, return_counts=True)
+        order = np.argsort(first, kind='stable')
+        keys, counts = keys[order], counts[order]
+        vocabulary = np.array(list(index), dtype='object')
+        return cls(keys // n_tokens, keys % n_tokens, counts.astype('int64'), vocabulary, len(values))
+
+    def _row_mask(self, rows):
+        """Normalise rows (None, boolean mask or positions) to a boolean mask"""
+        if rows is None:
+            return None
+        rows = np.asarray(rows)
+        if rows.dtype == bool:
+            return rows
+        mask = np.zeros(self.n_docs, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _selected(self, rows):
+        """Token ids and counts of the entries belonging to the selected rows"""
+        mask = self._row_mask(rows)
+        if mask is None:
+            return self.token_ids, self.counts
+        selected = mask[self.doc_ids]
+        return self.token_ids[selected], self.counts[selected]
+
+    def frequencies(self, rows=None):
+        """Total count per vocabulary entry over the selected rows"""
+        token_ids, counts = self._selected(rows)
+        return np.bincount(token_ids, weights=counts, minlength=len(self.vocabulary)).astype('int64')
+
+    def most_common(self, n=None, rows=None):
+        """(word, count) pairs ordered like Counter.most_common"""
+        token_ids, counts = self._selected(rows)
+        totals = np.bincount(token_ids, weights=counts, minlength=len(self.vocabulary)).astype('int64')
+        # Ties keep first-seen order within the selection, as Counter does
+        seen, first_seen = np.unique(token_ids, return_index=True)
+        rank = np.full(len(self.vocabulary), len(token_ids), dtype='int64')
+        rank[seen] = first_seen
+        order = np.lexsort((rank, -totals))
+        order = order[totals[order] > 0]
+        if n is not None:
+            order = order[:n]
+        return [(self.vocabulary[i], int(totals[i])) for i in order]
+
+    def to_dict(self, rows=None, max_words=None):
+        """Word -> frequency mapping for WordCloud.generate_from_frequencies"""
+        return dict(self.most_common(max_words, rows))